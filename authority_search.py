@@ -5,13 +5,18 @@ MVP Scope:
 - Other vocabularies (GTT, RERO, SWD, etc.) are optional/future extensions
 - Designed for East Asian collection in US academic library
 """
+import asyncio
+import threading
+import numpy as np
 import weaviate
 from weaviate.classes.query import MetadataQuery
-from typing import List, Optional, Dict
-from openai import OpenAI
+from typing import AsyncIterator, List, Optional, Dict
 
 from config import settings
+from openai_client import openai_client
 from models import AuthorityCandidate, TopicMatchResult, TopicCandidate
+from semantic_cache import QueryCache
+from embedding_cache import EmbeddingCache
 
 
 class AuthorityVectorSearch:
@@ -26,18 +31,56 @@ class AuthorityVectorSearch:
     # All supported vocabularies
     VOCABULARIES = MVP_VOCABULARIES + FUTURE_VOCABULARIES
     
+    # East Asian keywords for boosting
+    EAST_ASIAN_KEYWORDS = [
+        'china', 'chinese', 'japan', 'japanese', 'korea', 'korean',
+        'taiwan', 'taiwanese', 'mongolia', 'mongolian', 'tibet', 'tibetan',
+        'east asia', 'asia', 'asian', 'cjk', 'sino', 'confucian',
+        'buddhis', 'tao', 'zen', 'calligraphy', 'hanzi', 'kanji', 'hangul',
+        'ming', 'qing', 'tang', 'song', 'edo', 'meiji', 'joseon',
+        'beijing', 'shanghai', 'hong kong', 'tokyo', 'kyoto', 'seoul',
+        'yangtze', 'yellow river', 'mekong'
+    ]
+    
     def __init__(self):
         """Initialize Weaviate client and OpenAI for embeddings."""
         self.weaviate_url = settings.weaviate_url
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
+        self.openai_client = openai_client
         self.embedding_model = settings.embedding_model
         self.client = None
+        # True while the Weaviate connection is usable; checked by the search
+        # routes' dependency and cleared when a search finds the connection lost
+        self.ready = False
+        # Semantic cache of search results keyed by query embedding
+        self.query_cache = QueryCache(ttl_seconds=600, similarity_threshold=0.97)
+        # Persistent cache of embeddings, so repeat queries skip OpenAI entirely;
+        # opened on first lookup so importing this module touches no files
+        self._embedding_cache = None
+        self._embedding_cache_lock = threading.Lock()
+    
+    @property
+    def embedding_cache(self) -> EmbeddingCache:
+        """On-disk embedding cache, opened on first use."""
+        if self._embedding_cache is None:
+            # Lookups run in worker threads; only one may create the cache
+            with self._embedding_cache_lock:
+                if self._embedding_cache is None:
+                    # Full precision: a cached query must rank exactly like a fresh one
+                    self._embedding_cache = EmbeddingCache(
+                        settings.embedding_cache_path,
+                        self.embedding_model,
+                        dtype=np.float32
+                    )
+        return self._embedding_cache
         
     def connect(self):
         """Connect to Weaviate instance."""
         # Don't create new connection if already connected
         if self.client is not None:
-            return True
+            if self.ready:
+                return True
+            # The connection was lost: replace the stale client
+            self.disconnect()
             
         try:
             # Parse URL to extract host and port
@@ -50,11 +93,21 @@ class AuthorityVectorSearch:
                 host=host,
                 port=port
             )
+            self.ready = True
             return True
         except Exception as e:
             print(f"Failed to connect to Weaviate: {str(e)}")
             return False
     
+    def is_ready(self) -> bool:
+        """Check that the Weaviate connection is open and the server is ready."""
+        if self.client is None:
+            return False
+        try:
+            return self.client.is_ready()
+        except Exception:
+            return False
+    
     def disconnect(self):
         """Disconnect from Weaviate."""
         if self.client:
@@ -64,12 +117,30 @@ class AuthorityVectorSearch:
                 print(f"Warning: Error closing Weaviate connection: {e}")
             finally:
                 self.client = None
+                self.ready = False
+    
+    async def __aenter__(self):
+        """
+        Hold the Weaviate connection open for an ``async with`` block.
+        
+        Used by the CLI scripts so every search in the process shares one
+        connection; exiting the block closes it.
+        """
+        if not self.connect():
+            raise Exception(f"Failed to connect to Weaviate at {self.weaviate_url}")
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.disconnect()
     
     def initialize_schemas(self):
         """Initialize authority collection schemas for MVP vocabularies (LCSH + FAST)."""
         if not self.client:
             self.connect()
         
+        # Schema changes invalidate cached search results
+        self.query_cache.clear()
+        
         # MVP: Only create LCSH and FAST collections
         collections_to_create = [
             ("LCSHSubject", "Library of Congress Subject Headings - primary authority for 650/651/655"),
@@ -89,8 +160,14 @@ class AuthorityVectorSearch:
                 
                 self.client.collections.create(
                     name=collection_name,
-                    # No vectorizer - we provide vectors manually
-                    vector_config=weaviate.classes.config.Configure.Vectorizer.none(),
+                    # No vectorizer - we provide vectors manually.
+                    # Scalar quantization (SQ) stores each 3072-dim vector as int8
+                    # in the HNSW index, ~4x less vector memory.
+                    vector_config=weaviate.classes.config.Configure.Vectors.self_provided(
+                        vector_index_config=weaviate.classes.config.Configure.VectorIndex.hnsw(
+                            quantizer=weaviate.classes.config.Configure.VectorIndex.Quantizer.sq()
+                        )
+                    ),
                     properties=[
                         weaviate.classes.config.Property(
                             name="label",
@@ -163,16 +240,48 @@ class AuthorityVectorSearch:
             except Exception as e:
                 print(f"❌ Failed to create {collection_name}: {str(e)}")
     
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """Collapse whitespace so trivially different queries share a cache entry."""
+        return " ".join(text.split())
+    
     def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding vector for text using OpenAI."""
+        """Generate embedding vector for text using OpenAI (cached on disk)."""
+        return self._generate_embeddings([text])[0]
+    
+    def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embedding vectors for several texts in a single OpenAI request."""
+        texts = [self._normalize_text(text) for text in texts]
+        vectors = [
+            None if vector is None else vector.tolist()
+            for vector in self.embedding_cache.get_many(texts)
+        ]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if not missing:
+            return vectors
+        
         try:
             response = self.openai_client.embeddings.create(
                 model=self.embedding_model,
-                input=text
+                input=[texts[i] for i in missing]
             )
-            return response.data[0].embedding
         except Exception as e:
-            raise Exception(f"Failed to generate embedding: {str(e)}")
+            raise Exception(f"Failed to generate embeddings: {str(e)}")
+        
+        # Results carry an index; order them to match the input. Rounded to the
+        # cache dtype (FP32, as sent to Weaviate) so a later cache hit is identical
+        fresh = np.asarray(
+            [item.embedding for item in sorted(response.data, key=lambda d: d.index)],
+            dtype=self.embedding_cache.dtype
+        ).tolist()
+        try:
+            self.embedding_cache.put_many([texts[i] for i in missing], fresh)
+        except Exception as e:
+            print(f"⚠️  Failed to cache embeddings: {str(e)}")
+        
+        for i, vector in zip(missing, fresh):
+            vectors[i] = vector
+        return vectors
     
     def _get_collection_for_vocab(self, vocabulary: str) -> str:
         """Map vocabulary code to Weaviate collection name."""
@@ -228,6 +337,7 @@ class AuthorityVectorSearch:
                 },
                 vector=embedding
             )
+            self.query_cache.clear()
             
         except Exception as e:
             raise Exception(f"Failed to index authority entry: {str(e)}")
@@ -269,11 +379,18 @@ class AuthorityVectorSearch:
                         vector=embedding
                     )
             
+            self.query_cache.clear()
             print(f"✅ Batch indexed {len(entries)} {vocabulary.upper()} entries")
             
         except Exception as e:
             raise Exception(f"Failed to batch index: {str(e)}")
     
+    @classmethod
+    def _is_east_asian(cls, text: str) -> bool:
+        """Check whether text contains any East Asian keyword."""
+        text_lower = text.lower()
+        return any(keyword in text_lower for keyword in cls.EAST_ASIAN_KEYWORDS)
+    
     def _boost_east_asian_score(self, candidate: AuthorityCandidate, topic: str) -> float:
         """
         Boost scores for East Asian-related subjects.
@@ -285,25 +402,8 @@ class AuthorityVectorSearch:
         Returns:
             Boosted score
         """
-        # East Asian keywords for boosting
-        east_asian_keywords = [
-            'china', 'chinese', 'japan', 'japanese', 'korea', 'korean',
-            'taiwan', 'taiwanese', 'mongolia', 'mongolian', 'tibet', 'tibetan',
-            'east asia', 'asia', 'asian', 'cjk', 'sino', 'confucian',
-            'buddhis', 'tao', 'zen', 'calligraphy', 'hanzi', 'kanji', 'hangul',
-            'ming', 'qing', 'tang', 'song', 'edo', 'meiji', 'joseon',
-            'beijing', 'shanghai', 'hong kong', 'tokyo', 'kyoto', 'seoul',
-            'yangtze', 'yellow river', 'mekong'
-        ]
-        
-        label_lower = candidate.label.lower()
-        topic_lower = topic.lower()
-        
         # Check if either label or topic contains East Asian keywords
-        has_east_asian = any(keyword in label_lower or keyword in topic_lower 
-                            for keyword in east_asian_keywords)
-        
-        if has_east_asian:
+        if self._is_east_asian(candidate.label) or self._is_east_asian(topic):
             # Boost by 10% (multiply by 1.1), cap at 1.0
             boosted_score = min(candidate.score * 1.1, 1.0)
             return boosted_score
@@ -331,60 +431,152 @@ class AuthorityVectorSearch:
         Returns:
             List of AuthorityCandidate objects
         """
-        if not self.client:
-            self.connect()
-        
         if vocabularies is None:
             vocabularies = ["lcsh", "fast"]
         
         try:
-            # Generate embedding for the topic
-            topic_embedding = self._generate_embedding(topic)
+            # Generate embedding for the topic (off the event loop, so
+            # concurrent searches overlap their OpenAI calls)
+            topic_embedding = await asyncio.to_thread(self._generate_embedding, topic)
             
-            all_candidates = []
+            # Near-duplicate queries are served from the semantic cache. Whether
+            # the topic itself triggers the boost is part of the key: a
+            # near-duplicate query without East Asian keywords gets different scores
+            topic_boosted = east_asian_boost and self._is_east_asian(topic)
+            cache_namespace = (tuple(vocabularies), limit_per_vocab, min_score, east_asian_boost, topic_boosted)
+            cached = self.query_cache.get(topic_embedding, cache_namespace)
+            if cached is not None:
+                return [c.model_copy() for c in cached]
             
-            # Search each vocabulary
-            for vocab in vocabularies:
-                collection_name = self._get_collection_for_vocab(vocab)
-                
-                try:
-                    collection = self.client.collections.get(collection_name)
-                    
-                    # Perform vector search
-                    response = collection.query.near_vector(
-                        near_vector=topic_embedding,
-                        limit=limit_per_vocab,
-                        return_metadata=MetadataQuery(certainty=True)
-                    )
-                    
-                    # Parse results
-                    for obj in response.objects:
-                        if obj.metadata.certainty and obj.metadata.certainty >= min_score:
-                            candidate = AuthorityCandidate(
-                                label=obj.properties.get("label", ""),
-                                uri=obj.properties.get("uri", ""),
-                                vocabulary=obj.properties.get("vocabulary", vocab),
-                                score=obj.metadata.certainty
-                            )
-                            
-                            # Apply East Asian boosting
-                            if east_asian_boost:
-                                candidate.score = self._boost_east_asian_score(candidate, topic)
-                            
-                            all_candidates.append(candidate)
-                
-                except Exception as e:
-                    print(f"Warning: Failed to search {vocab}: {str(e)}")
-                    continue
+            # Query every vocabulary concurrently over the shared gRPC channel,
+            # so the search costs one round trip instead of one per vocabulary
+            per_vocab = await asyncio.gather(*[
+                asyncio.to_thread(
+                    self._search_vocab,
+                    topic, topic_embedding, vocab, limit_per_vocab, min_score, east_asian_boost
+                )
+                for vocab in vocabularies
+            ])
             
             # Sort by score descending (boosted scores will rank higher)
+            all_candidates = [c for vocab_results in per_vocab for c in vocab_results]
             all_candidates.sort(key=lambda x: x.score, reverse=True)
             
-            return all_candidates
+            if all_candidates:
+                self.query_cache.put(topic_embedding, all_candidates, cache_namespace)
+            
+            return [c.model_copy() for c in all_candidates]
+            
+        except Exception as e:
+            raise Exception(f"Authority search failed: {str(e)}")
+    
+    async def search_authorities_stream(
+        self,
+        topic: str,
+        vocabularies: List[str] = None,
+        limit_per_vocab: int = 5,
+        min_score: float = 0.7,
+        east_asian_boost: bool = True
+    ) -> AsyncIterator[AuthorityCandidate]:
+        """
+        Search like search_authorities, yielding candidates as each vocabulary answers.
+        
+        Results come per vocabulary, best first, in the order the vocabularies
+        respond, so callers can start emitting before the slowest query ends.
+        
+        Args:
+            topic: Semantic topic to search for
+            vocabularies: List of vocabulary codes to search (default: ["lcsh", "fast"])
+            limit_per_vocab: Maximum results per vocabulary
+            min_score: Minimum certainty threshold
+            east_asian_boost: Apply boosting for East Asian-related subjects
+        
+        Yields:
+            AuthorityCandidate objects
+        """
+        if vocabularies is None:
+            vocabularies = ["lcsh", "fast"]
+        
+        try:
+            topic_embedding = await asyncio.to_thread(self._generate_embedding, topic)
+            
+            cache_namespace = (tuple(vocabularies), limit_per_vocab, min_score, east_asian_boost)
+            cached = self.query_cache.get(topic_embedding, cache_namespace)
+            if cached is not None:
+                for c in cached:
+                    yield c.model_copy()
+                return
             
+            all_candidates = []
+            for pending in asyncio.as_completed([
+                asyncio.to_thread(
+                    self._search_vocab,
+                    topic, topic_embedding, vocab, limit_per_vocab, min_score, east_asian_boost
+                )
+                for vocab in vocabularies
+            ]):
+                vocab_results = await pending
+                vocab_results.sort(key=lambda x: x.score, reverse=True)
+                all_candidates.extend(vocab_results)
+                for c in vocab_results:
+                    yield c.model_copy()
+            
+            # Cache in the same merged order search_authorities returns
+            if all_candidates:
+                all_candidates.sort(key=lambda x: x.score, reverse=True)
+                self.query_cache.put(topic_embedding, all_candidates, cache_namespace)
+        
         except Exception as e:
             raise Exception(f"Authority search failed: {str(e)}")
     
+    def _search_vocab(
+        self,
+        topic: str,
+        topic_embedding: List[float],
+        vocab: str,
+        limit_per_vocab: int,
+        min_score: float,
+        east_asian_boost: bool
+    ) -> List[AuthorityCandidate]:
+        """Run one near-vector query against a single vocabulary collection (unsorted)."""
+        candidates = []
+        collection_name = self._get_collection_for_vocab(vocab)
+        
+        try:
+            collection = self.client.collections.get(collection_name)
+            
+            # Perform vector search; the certainty threshold is applied by
+            # Weaviate, so rejected hits are never returned or parsed
+            response = collection.query.near_vector(
+                near_vector=topic_embedding,
+                limit=limit_per_vocab,
+                certainty=min_score or None,
+                return_metadata=MetadataQuery(certainty=True)
+            )
+            
+            # Parse results
+            for obj in response.objects:
+                candidate = AuthorityCandidate(
+                    label=obj.properties.get("label", ""),
+                    uri=obj.properties.get("uri", ""),
+                    vocabulary=obj.properties.get("vocabulary", vocab),
+                    score=obj.metadata.certainty
+                )
+                
+                # Apply East Asian boosting
+                if east_asian_boost:
+                    candidate.score = self._boost_east_asian_score(candidate, topic)
+                
+                candidates.append(candidate)
+        
+        except Exception as e:
+            print(f"Warning: Failed to search {vocab}: {str(e)}")
+            # If the server is gone, make the next request reconnect
+            if not self.is_ready():
+                self.ready = False
+        
+        return candidates
+    
     async def search_multiple_topics(
         self,
         topics: List[TopicCandidate],
@@ -395,6 +587,12 @@ class AuthorityVectorSearch:
         """
         Search authority matches for multiple topics.
         
+        All topics are embedded in a single OpenAI request. Topics not served
+        by the semantic cache are then fanned out as one round of concurrent
+        (topic, vocabulary) near-vector queries multiplexed over the shared
+        gRPC channel, so the search costs about one round trip, not one per
+        topic per vocabulary.
+        
         Args:
             topics: List of TopicCandidate objects
             vocabularies: List of vocabularies to search
@@ -404,24 +602,66 @@ class AuthorityVectorSearch:
         Returns:
             List of TopicMatchResult objects
         """
-        results = []
+        if not topics:
+            return []
         
-        for topic_candidate in topics:
-            candidates = await self.search_authorities(
-                topic=topic_candidate.topic,
-                vocabularies=vocabularies,
-                limit_per_vocab=limit_per_vocab,
-                min_score=min_score
-            )
-            
-            results.append(TopicMatchResult(
+        if vocabularies is None:
+            vocabularies = ["lcsh", "fast"]
+        
+        try:
+            # One embeddings request for all topics, off the event loop
+            embeddings = await asyncio.to_thread(self._generate_embeddings, [t.topic for t in topics])
+        except Exception as e:
+            raise Exception(f"Authority search failed: {str(e)}")
+        
+        # Serve near-duplicate topics from the semantic cache first, keyed like
+        # search_authorities (including whether the topic triggers the boost)
+        cache_namespaces = [
+            (tuple(vocabularies), limit_per_vocab, min_score, True, self._is_east_asian(t.topic))
+            for t in topics
+        ]
+        results = [
+            self.query_cache.get(embedding, cache_namespace)
+            for embedding, cache_namespace in zip(embeddings, cache_namespaces)
+        ]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        
+        semaphore = asyncio.Semaphore(16)
+        
+        async def search_vocab(i: int, vocab: str) -> List[AuthorityCandidate]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._search_vocab,
+                    topics[i].topic,
+                    embeddings[i],
+                    vocab,
+                    limit_per_vocab,
+                    min_score,
+                    True
+                )
+        
+        per_vocab = await asyncio.gather(*[
+            search_vocab(i, vocab) for i in misses for vocab in vocabularies
+        ])
+        
+        # Merge each topic's per-vocabulary results back together
+        n_vocabs = len(vocabularies)
+        for j, i in enumerate(misses):
+            candidates = [c for vocab_results in per_vocab[j * n_vocabs:(j + 1) * n_vocabs] for c in vocab_results]
+            candidates.sort(key=lambda x: x.score, reverse=True)
+            if candidates:
+                self.query_cache.put(embeddings[i], candidates, cache_namespaces[i])
+            results[i] = candidates
+        
+        return [
+            TopicMatchResult(
                 topic=topic_candidate.topic,
                 topic_type=topic_candidate.type,
-                authority_candidates=candidates,
+                authority_candidates=[c.model_copy() for c in candidates],
                 matches=[]  # Legacy field
-            ))
-        
-        return results
+            )
+            for topic_candidate, candidates in zip(topics, results)
+        ]
     
     def get_stats(self) -> Dict:
         """Get statistics about MVP authority indexes (LCSH + FAST only)."""
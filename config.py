@@ -19,6 +19,8 @@ class Settings(BaseSettings):
     
     # OpenAI Configuration
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
+    # Seconds to establish a connection (read timeouts stay at 600s)
+    openai_connect_timeout: float = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5.0"))
     
     # Model Configuration - Using o4-mini with Responses API
     default_model: str = os.getenv("DEFAULT_MODEL", "o4-mini")
@@ -36,6 +38,8 @@ class Settings(BaseSettings):
     # Application Configuration
     data_dir: Path = Path(os.getenv("DATA_DIR", "./data/records"))
     samples_dir: Path = Path(os.getenv("SAMPLES_DIR", "./samples"))
+    # Anchored at the project root so scripts run from other directories share it
+    embedding_cache_path: Path = Path(os.getenv("EMBEDDING_CACHE_PATH", str(Path(__file__).resolve().parent / "data" / "embeddings.sqlite")))
     
     # LLM Settings (legacy - reasoning_effort replaces temperature for o4-mini)
     topic_temperature: float = float(os.getenv("TOPIC_TEMPERATURE", "0.1"))  # Deprecated
@@ -0,0 +1,81 @@
+"""Persistent embedding cache.
+
+Embeddings for a given model and text never change, so they are stored on
+disk and reused across runs: repeat search queries and re-imported
+authority labels skip the OpenAI round trip entirely.
+"""
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+# Bulk-imported embeddings are held (and cached) in half precision, well below
+# the error of the index's SQ quantizer; the Weaviate client widens them to
+# FP32 on the wire
+EMBEDDING_DTYPE = np.float16
+
+
+class EmbeddingCache:
+    """
+    Content-addressed on-disk cache of embeddings.
+    
+    Vectors are stored as dtype blobs in SQLite (float16 by default: 6 KB
+    instead of 12 KB for a 3072-dim embedding), keyed by a hash of the
+    embedding model, dtype and text, so only texts that have never been
+    embedded reach OpenAI.
+    """
+    
+    def __init__(self, path: Path, model: str = "text-embedding-3-large", dtype=EMBEDDING_DTYPE):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.model = model
+        self.dtype = dtype
+        # Shared by worker threads
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        # WAL: per-batch commits append to the log instead of rewriting pages,
+        # and an interrupted run keeps everything committed so far
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+        self.lock = threading.Lock()
+    
+    def _key(self, text: str) -> bytes:
+        return hashlib.blake2b(f"{self.model}\n{np.dtype(self.dtype).name}\n{text}".encode('utf-8'), digest_size=16).digest()
+    
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Return the cached vector for text, or None if not cached."""
+        return self.get_many([text])[0]
+    
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Return cached vectors for texts (None where not cached)."""
+        keys = [self._key(text) for text in texts]
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(keys))})",
+                keys
+            ).fetchall()
+        found = {key: vec for key, vec in rows}
+        return [
+            np.frombuffer(found[key], dtype=self.dtype) if key in found else None
+            for key in keys
+        ]
+    
+    def put(self, text: str, vector):
+        """Store the vector for text."""
+        self.put_many([text], [vector])
+    
+    def put_many(self, texts: List[str], vectors: List[Optional[np.ndarray]]):
+        """Store vectors for texts (None entries are skipped)."""
+        rows = [
+            (self._key(text), np.asarray(vector, dtype=self.dtype).tobytes())
+            for text, vector in zip(texts, vectors)
+            if vector is not None
+        ]
+        with self.lock:
+            self.conn.executemany("INSERT OR IGNORE INTO embeddings (key, vec) VALUES (?, ?)", rows)
+            self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
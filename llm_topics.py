@@ -4,9 +4,9 @@ Uses o4-mini with reasoning_effort='high' for better topic generation.
 """
 import json
 from typing import List
-from openai import OpenAI
 
 from config import settings
+from openai_client import openai_client
 from models import BookMetadata, TopicCandidate
 
 
@@ -15,7 +15,7 @@ class TopicGenerator:
     
     def __init__(self):
         """Initialize topic generator with OpenAI client."""
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = openai_client
         self.model = settings.topic_model
         self.reasoning_effort = settings.reasoning_effort
         self.max_topics = settings.max_topics
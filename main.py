@@ -10,8 +10,9 @@ from fastapi.responses import FileResponse
 from pathlib import Path
 from contextlib import asynccontextmanager
 
-from routes import router
+from routes import router, compress_old_record_shards
 from authority_search import authority_search
+from openai_client import openai_client
 from config import settings
 
 
@@ -24,8 +25,16 @@ async def lifespan(app: FastAPI):
     print(f"🔗 Weaviate URL: {settings.weaviate_url}")
     print(f"🤖 Model: {settings.default_model} (reasoning_effort={settings.reasoning_effort})")
     
+    # Compress record shards from previous days
+    compress_old_record_shards()
+    
+    # One pooled OpenAI client shared by all modules
+    app.state.openai = openai_client
+    
+    # Open one long-lived Weaviate connection shared by all requests
     try:
         authority_search.connect()
+        app.state.weaviate = authority_search.client
         print("✅ Connected to Weaviate (LCSH + FAST)")
     except Exception as e:
         print(f"⚠️  Warning: Could not connect to Weaviate: {str(e)}")
@@ -37,6 +46,7 @@ async def lifespan(app: FastAPI):
     print("👋 Shutting down...")
     authority_search.disconnect()
     print("✅ Disconnected from Weaviate")
+    openai_client.close()
 
 
 # Create FastAPI app
@@ -10,9 +10,9 @@ Uses OpenAI o4-mini with Responses API.
 import re
 import json
 from typing import List, Optional, Dict, Literal
-from openai import OpenAI
 
 from config import settings
+from openai_client import openai_client
 from models import (
     AuthorityCandidate, 
     Subject65X, 
@@ -42,7 +42,7 @@ class MARC65XBuilder:
     
     def __init__(self):
         """Initialize MARC builder with o4-mini."""
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = openai_client
         self.model = settings.explanation_model
         self.reasoning_effort = settings.reasoning_effort
     
@@ -0,0 +1,191 @@
+"""Shared conversion of authority search results into MARC 65X fields.
+
+Used by the search routes and the search_to_marc scripts, so every entry
+point splits and classifies headings the same way.
+"""
+import re
+import json
+from functools import lru_cache
+from typing import Any, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # Falls back to the standard library encoder in dumps_json
+    orjson = None
+
+from models import Subject65X, Subfield
+
+# Subdivision classifiers for headings split on '--': chronological terms or
+# a date range ("960-1644") make $y, topical keywords keep a capitalized $x
+_CHRONO_RE = re.compile(r'century|b\.c\.|a\.d\.|-.*\d|\d.*-', re.I | re.S)
+_TOPICAL_RE = re.compile(r'history|politics|social|conditions|civilization', re.I)
+
+# MARC tag per subject type and second indicator per vocabulary
+TAG_BY_SUBJECT_TYPE = {'geographic': '651', 'genre_form': '655'}
+VOCAB_IND2 = {'lcsh': '0', 'fast': '7'}
+
+# Human-readable names of subfield codes for detailed display
+SUBFIELD_MEANINGS = {
+    'a': 'Main heading',
+    'x': 'General subdivision',
+    'y': 'Chronological subdivision',
+    'z': 'Geographic subdivision',
+    'v': 'Form subdivision',
+    '0': 'Authority URI',
+    '2': 'Source vocabulary'
+}
+
+
+@lru_cache(maxsize=4096)
+def parse_heading_subfields(heading: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Split a heading into (code, value) subfield pairs.
+    
+    Cached by heading, since the same LCSH headings recur across searches
+    and batch runs. The result is an immutable tuple so callers can share it.
+    
+    Args:
+        heading: Authority label, with subdivisions separated by '--'
+    
+    Returns:
+        Tuple of (code, value) pairs, starting with $a
+    """
+    # Note: LCSH uses '--' without spaces
+    if '--' not in heading:
+        # No subdivisions, just main heading
+        return (('a', heading),)
+    
+    parts = heading.split('--')
+    
+    # First part is always $a
+    subfields = [('a', parts[0])]
+    
+    # Subsequent parts need classification
+    for part in parts[1:]:
+        # Chronological patterns include year ranges (e.g., "960-1644", "20th century")
+        if _CHRONO_RE.search(part):
+            code = 'y'  # Chronological
+        elif part[:1].isupper() and not _TOPICAL_RE.search(part):
+            code = 'z'  # Geographic (starts with capital, looks like place name)
+        else:
+            code = 'x'  # General
+        subfields.append((code, part))
+    
+    return tuple(subfields)
+
+
+def authority_to_marc65x(authority_candidate, score: float = None) -> Subject65X:
+    """
+    Convert AuthorityCandidate to Subject65X MARC field.
+    
+    Args:
+        authority_candidate: Authority search result
+        score: Search confidence score
+    
+    Returns:
+        Subject65X object
+    """
+    # Determine MARC tag based on subject type (topical or unknown: 650)
+    tag = TAG_BY_SUBJECT_TYPE.get(getattr(authority_candidate, 'subject_type', 'topical'), '650')
+    
+    # Determine second indicator based on vocabulary
+    vocab = authority_candidate.vocabulary.lower()
+    ind2 = VOCAB_IND2.get(vocab, '7')
+    
+    # Parse heading into subfields
+    heading = authority_candidate.label
+    subfields = [
+        Subfield(code=code, value=value)
+        for code, value in parse_heading_subfields(heading)
+    ]
+    
+    # Add authority record control number (URI)
+    if authority_candidate.uri:
+        subfields.append(Subfield(code='0', value=authority_candidate.uri))
+    
+    # Add source code if not LCSH
+    if vocab != 'lcsh':
+        subfields.append(Subfield(code='2', value=vocab))
+    
+    if score is None:
+        score = authority_candidate.score
+    return Subject65X(
+        tag=tag,
+        ind1='_',
+        ind2=ind2,
+        vocabulary=vocab,
+        heading_string=heading,
+        subfields=subfields,
+        uri=authority_candidate.uri,
+        source_system='ai_generated',
+        score=score,
+        explanation=f"Matched with confidence {score:.2%}"
+    )
+
+
+def format_marc_display(subject_65x: Subject65X) -> str:
+    """Format MARC field for human-readable display."""
+    return subject_65x.to_marc_string()
+
+
+def format_marc_listing(i: int, subject_65x: Subject65X, detailed: bool = False) -> str:
+    """
+    Format one numbered entry of a MARC field listing.
+    
+    Args:
+        i: Position of the field in the listing
+        subject_65x: MARC field to format
+        detailed: Add confidence and a subfield breakdown below the field
+    
+    Returns:
+        Entry text (lines joined, without a trailing newline)
+    """
+    non_lcsh = subject_65x.vocabulary != 'lcsh'
+    if not detailed:
+        # Compact format - just the MARC field
+        vocab_tag = f" ({subject_65x.vocabulary.upper()})" if non_lcsh else ""
+        return f"{i:2}. {format_marc_display(subject_65x):70s} [{subject_65x.score:.0%}]{vocab_tag}"
+    
+    # MARC format - one line per field, details on the next lines
+    vocab_indicator = f"({subject_65x.vocabulary.upper()})" if non_lcsh else ""
+    lines = [
+        f"{i:2}. {format_marc_display(subject_65x)}",
+        f"    Confidence: {subject_65x.score:.1%} {vocab_indicator}",
+        "    Subfields:"
+    ]
+    lines.extend(
+        f"       ${sf.code} {sf.value} ({SUBFIELD_MEANINGS.get(sf.code, 'Other')})"
+        for sf in subject_65x.subfields
+    )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def format_marc_json(subject_65x: Subject65X) -> dict:
+    """Format MARC field as JSON."""
+    return {
+        'tag': subject_65x.tag,
+        'ind1': subject_65x.ind1,
+        'ind2': subject_65x.ind2,
+        'subfields': [
+            {'code': sf.code, 'value': sf.value}
+            for sf in subject_65x.subfields
+        ],
+        'vocabulary': subject_65x.vocabulary,
+        'uri': subject_65x.uri,
+        'score': subject_65x.score,
+        'explanation': subject_65x.explanation
+    }
+
+
+def dumps_json(obj: Any) -> str:
+    """
+    Encode CLI JSON output, indented, with non-ASCII headings kept as-is.
+    
+    Uses orjson when installed (over 20x faster on large batch outputs),
+    otherwise the standard library encoder with the same layout.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
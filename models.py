@@ -284,6 +284,21 @@ class Build65XResponse(BaseModel):
     message: Optional[str] = None
 
 
+class PipelineRequest(BaseModel):
+    """Request for the combined topics, authority match and 65X pipeline."""
+    metadata: BookMetadata
+    vocabularies: Optional[List[str]] = None
+
+
+class PipelineResponse(BaseModel):
+    """Response from the combined pipeline."""
+    success: bool
+    topics: List[TopicCandidate]
+    matches: List[TopicMatchResult]
+    subjects_65x: List[Subject65X]
+    message: Optional[str] = None
+
+
 class MARC650Response(BaseModel):
     """Response from MARC 650 generation (legacy)."""
     success: bool
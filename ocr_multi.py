@@ -4,10 +4,10 @@ Uses OpenAI o4-mini with Responses API and vision support.
 """
 import base64
 import json
-from typing import List, Tuple
-from openai import OpenAI
+from typing import BinaryIO, List, Tuple, Union
 
 from config import settings
+from openai_client import openai_client
 from models import BookMetadata, PageImage
 
 
@@ -16,24 +16,27 @@ class MultiImageOCRProcessor:
     
     def __init__(self):
         """Initialize OCR processor with OpenAI client."""
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = openai_client
         self.model = settings.ocr_model
         self.reasoning_effort = settings.reasoning_effort
         
-    def _encode_image(self, image_bytes: bytes) -> str:
-        """Encode image bytes to base64 string."""
-        return base64.b64encode(image_bytes).decode('utf-8')
+    def _encode_image(self, image: Union[bytes, BinaryIO]) -> str:
+        """Encode image bytes or a binary file object to base64 string."""
+        if not isinstance(image, (bytes, bytearray)):
+            image.seek(0)
+            image = image.read()
+        return base64.b64encode(image).decode('utf-8')
     
     async def classify_and_extract_single_page(
         self,
-        image_bytes: bytes,
+        image_bytes: Union[bytes, BinaryIO],
         page_hint: str = None
     ) -> PageImage:
         """
         Classify a single page and extract its text.
         
         Args:
-            image_bytes: Image bytes
+            image_bytes: Image bytes or a binary file object (e.g. a spooled upload)
             page_hint: Optional client-side hint
             
         Returns:
@@ -277,13 +280,13 @@ EXTRACTION GUIDELINES:
     
     async def process_multiple_images(
         self,
-        images: List[Tuple[bytes, str]]
+        images: List[Tuple[Union[bytes, BinaryIO], str]]
     ) -> BookMetadata:
         """
         Process multiple images with page classification.
         
         Args:
-            images: List of (image_bytes, page_hint) tuples
+            images: List of (image_bytes or binary file object, page_hint) tuples
             
         Returns:
             BookMetadata with aggregated information
@@ -0,0 +1,24 @@
+"""Shared OpenAI client.
+
+OCR, topic generation, authority search and 65X explanations all use this
+one client, so every OpenAI call made by the app reuses a single pooled
+HTTP/2 connection pool instead of one pool per module.
+"""
+import httpx
+from openai import OpenAI
+
+from config import settings
+
+
+# One keep-alive pool for all OpenAI requests (amortizes TLS handshakes)
+http_client = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+)
+
+# The SDK's limits (600s, 5s to connect) unless OPENAI_CONNECT_TIMEOUT is
+# lowered, e.g. for batch scripts that would rather fail fast and retry
+OPENAI_TIMEOUT = httpx.Timeout(600.0, connect=settings.openai_connect_timeout)
+
+# Global client instance
+openai_client = OpenAI(api_key=settings.openai_api_key, http_client=http_client, timeout=OPENAI_TIMEOUT)
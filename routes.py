@@ -3,11 +3,20 @@
 Uses OpenAI o4-mini with Responses API.
 MVP Scope: LCSH and FAST vocabularies only.
 """
+import gzip
+import time
 import uuid
 import json
+import shutil
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import date
 from pathlib import Path
 from typing import List, Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+import aiofiles
+import pydantic_core
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, BackgroundTasks, Depends
 from fastapi.responses import JSONResponse
 
 from config import settings
@@ -19,6 +28,9 @@ from models import (
     LCSHMatchResponse,
     Build65XRequest,
     Build65XResponse,
+    BookMetadata,
+    PipelineRequest,
+    PipelineResponse,
     SubmitFinalRequest,
     SubmitFinalResponse,
     FinalRecord,
@@ -30,11 +42,41 @@ from ocr_multi import multi_ocr_processor
 from llm_topics import topic_generator
 from authority_search import authority_search
 from marc_65x_builder import marc_65x_builder
+from marc_common import TAG_BY_SUBJECT_TYPE, VOCAB_IND2, parse_heading_subfields
 
 
 # Create router
 router = APIRouter(prefix="/api", tags=["subject-heading"])
 
+# LRU cache of generated topics keyed by metadata hash
+_TOPIC_CACHE: "OrderedDict[str, List[TopicCandidate]]" = OrderedDict()
+_TOPIC_CACHE_MAX = 512
+
+# Number of /submit-final records still waiting to be written to disk
+_pending_writes = 0
+
+# Serializes appends to the daily records shard
+_records_lock = asyncio.Lock()
+_current_shard: Optional[str] = None
+# Plain-string data dir so the hot path skips Path joins
+_DATA_DIR_STR = str(settings.data_dir)
+
+
+async def require_authority_search():
+    """
+    Dependency that guards search routes on the Weaviate connection opened at startup.
+    
+    While the connection is up this is a single flag check, so search routes
+    never inspect or reopen the client themselves. If startup could not
+    connect, or a search found the connection lost, one reconnect is
+    attempted (in a worker thread, so a down server doesn't stall the event
+    loop) before failing with 503.
+    """
+    if authority_search.ready:
+        return
+    if not await asyncio.to_thread(authority_search.connect):
+        raise HTTPException(status_code=503, detail="Weaviate is not connected")
+
 
 @router.post("/ingest-images", response_model=IngestImagesResponse)
 async def ingest_images(
@@ -60,11 +102,8 @@ async def ingest_images(
         while len(hints) < len(images):
             hints.append(None)
         
-        # Read all images
-        image_data = []
-        for img, hint in zip(images, hints):
-            img_bytes = await img.read()
-            image_data.append((img_bytes, hint))
+        # Pass the spooled upload files through; each image is read only when OCR reaches it
+        image_data = [(img.file, hint) for img, hint in zip(images, hints)]
         
         # Process with multi-image OCR
         metadata = await multi_ocr_processor.process_multiple_images(image_data)
@@ -79,6 +118,32 @@ async def ingest_images(
         raise HTTPException(status_code=500, detail=f"Multi-image OCR failed: {str(e)}")
 
 
+async def _generate_topics_cached(metadata: BookMetadata) -> List[TopicCandidate]:
+    """Generate topics for metadata, serving repeats from the topic cache."""
+    # Librarians often re-run topics on the same OCR metadata - serve repeats from cache
+    cache_key = hashlib.blake2b(
+        metadata.model_dump_json().encode("utf-8"),
+        digest_size=16
+    ).hexdigest()
+    
+    topics = _TOPIC_CACHE.get(cache_key)
+    if topics is not None:
+        _TOPIC_CACHE.move_to_end(cache_key)
+    else:
+        topics = await topic_generator.generate_topics(metadata)
+        _TOPIC_CACHE[cache_key] = topics
+        if len(_TOPIC_CACHE) > _TOPIC_CACHE_MAX:
+            _TOPIC_CACHE.popitem(last=False)
+    return topics
+
+
+def _mvp_vocabularies(vocabularies: Optional[List[str]]) -> List[str]:
+    """Restrict requested vocabularies to the MVP ones (LCSH and FAST)."""
+    if vocabularies:
+        vocabularies = [v for v in vocabularies if v in ["lcsh", "fast"]]
+    return vocabularies or ["lcsh", "fast"]
+
+
 @router.post("/generate-topics", response_model=GenerateTopicsResponse)
 async def generate_topics(request: GenerateTopicsRequest):
     """
@@ -87,7 +152,7 @@ async def generate_topics(request: GenerateTopicsRequest):
     - **metadata**: BookMetadata object from OCR
     """
     try:
-        topics = await topic_generator.generate_topics(request.metadata)
+        topics = await _generate_topics_cached(request.metadata)
         
         return GenerateTopicsResponse(
             success=True,
@@ -99,7 +164,7 @@ async def generate_topics(request: GenerateTopicsRequest):
         raise HTTPException(status_code=500, detail=f"Topic generation failed: {str(e)}")
 
 
-@router.post("/authority-match", response_model=LCSHMatchResponse)
+@router.post("/authority-match", response_model=LCSHMatchResponse, dependencies=[Depends(require_authority_search)])
 async def authority_match(request: LCSHMatchRequest):
     """
     Find authority heading matches for LCSH and FAST vocabularies (MVP).
@@ -110,10 +175,6 @@ async def authority_match(request: LCSHMatchRequest):
     are future extensions.
     """
     try:
-        # Ensure connection
-        if not authority_search.client:
-            authority_search.connect()
-        
         # Convert topics to TopicCandidate objects (default to topical)
         topic_candidates = [TopicCandidate(topic=t, type="topical") for t in request.topics]
         
@@ -135,7 +196,7 @@ async def authority_match(request: LCSHMatchRequest):
         raise HTTPException(status_code=500, detail=f"Authority matching failed: {str(e)}")
 
 
-@router.post("/authority-match-typed")
+@router.post("/authority-match-typed", dependencies=[Depends(require_authority_search)])
 async def authority_match_typed(
     topics: List[dict],
     vocabularies: Optional[List[str]] = None
@@ -161,23 +222,12 @@ async def authority_match_typed(
     ```
     """
     try:
-        if not authority_search.client:
-            authority_search.connect()
-        
         topic_candidates = [TopicCandidate(**t) for t in topics]
         
         # MVP: Only allow LCSH and FAST
-        if vocabularies is None:
-            vocabularies = ["lcsh", "fast"]
-        else:
-            # Filter to MVP vocabularies only
-            vocabularies = [v for v in vocabularies if v in ["lcsh", "fast"]]
-            if not vocabularies:
-                vocabularies = ["lcsh", "fast"]
-        
         matches = await authority_search.search_multiple_topics(
             topics=topic_candidates,
-            vocabularies=vocabularies,
+            vocabularies=_mvp_vocabularies(vocabularies),
             limit_per_vocab=5,
             min_score=0.7
         )
@@ -240,17 +290,109 @@ async def build_65x_fields(request: Build65XRequest):
         raise HTTPException(status_code=500, detail=f"Subject65X generation failed: {str(e)}")
 
 
+@router.post("/pipeline", response_model=PipelineResponse, dependencies=[Depends(require_authority_search)])
+async def pipeline(request: PipelineRequest):
+    """
+    Generate topics, match authorities and build 65X fields in one request.
+    
+    Runs /generate-topics, /authority-match-typed and /build-65x in process,
+    so unattended clients (batch cataloging, scripts) make one round trip
+    instead of three and never re-send topics or matches. The interactive
+    UI keeps the separate steps so librarians can edit between them.
+    
+    - **metadata**: BookMetadata object from OCR
+    - **vocabularies**: Optional list (default: ["lcsh", "fast"])
+    """
+    try:
+        vocabularies = _mvp_vocabularies(request.vocabularies)
+        
+        topics = await _generate_topics_cached(request.metadata)
+        matches = await authority_search.search_multiple_topics(
+            topics=topics,
+            vocabularies=vocabularies,
+            limit_per_vocab=5,
+            min_score=0.7
+        )
+        subjects_65x = await marc_65x_builder.build_from_topic_matches(
+            topic_matches=matches,
+            max_per_topic=3,
+            generate_explanations=True,
+            vocabularies=vocabularies
+        )
+        
+        return PipelineResponse(
+            success=True,
+            topics=topics,
+            matches=matches,
+            subjects_65x=subjects_65x,
+            message=f"Generated {len(topics)} topics and {len(subjects_65x)} Subject65X entries"
+        )
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline failed: {str(e)}")
+
+
+def _records_shard_path() -> str:
+    """Path of today's append-only JSONL shard of final records."""
+    return f"{_DATA_DIR_STR}/records-{date.today().isoformat()}.jsonl"
+
+
+def compress_old_record_shards(max_age_days: int = 1):
+    """
+    Gzip JSONL record shards older than max_age_days.
+    
+    Today's shard is never touched; compressed shards are written next to
+    the original as records-YYYY-MM-DD.jsonl.gz and the original is removed.
+    """
+    today_shard = _records_shard_path()
+    cutoff = time.time() - max_age_days * 86400
+    
+    for path in settings.data_dir.glob("records-*.jsonl"):
+        if str(path) == today_shard or path.stat().st_mtime > cutoff:
+            continue
+        try:
+            with open(path, 'rb') as src, gzip.open(path.with_suffix(".jsonl.gz"), 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            path.unlink()
+        except Exception as e:
+            print(f"Failed to compress {path.name}: {str(e)}")
+
+
+async def _persist_record(file_path: str, record: FinalRecord):
+    """Append a final record as one JSON line to a records shard (runs as a background task)."""
+    global _pending_writes, _current_shard
+    try:
+        # Serialize straight to UTF-8 bytes (no dict or str intermediate)
+        payload = pydantic_core.to_json(record) + b"\n"
+        async with _records_lock:
+            async with aiofiles.open(file_path, 'ab') as f:
+                await f.write(payload)
+            
+            # New day, new shard: compress the ones that are now old
+            if _current_shard is not None and file_path != _current_shard:
+                await asyncio.to_thread(compress_old_record_shards)
+            _current_shard = file_path
+    except Exception as e:
+        print(f"Failed to save record {record.uuid}: {str(e)}")
+    finally:
+        _pending_writes -= 1
+
+
 @router.post("/submit-final", response_model=SubmitFinalResponse)
-async def submit_final(request: SubmitFinalRequest):
+async def submit_final(request: SubmitFinalRequest, background_tasks: BackgroundTasks):
     """
     Store final librarian selections for continual improvement.
     
-    Saves complete record to JSON file for future training/analysis.
+    Appends the complete record to a daily JSONL shard
+    (records-YYYY-MM-DD.jsonl) for future training/analysis.
     The record includes Subject65X entries with LCSH and FAST headings.
+    The line is written after the response is sent; the record's uuid
+    identifies it within the shard.
     """
+    global _pending_writes
     try:
         # Generate UUID
-        record_uuid = str(uuid.uuid4())
+        record_uuid = uuid.uuid4().hex
         
         # Create final record with Subject65X
         record = FinalRecord(
@@ -264,15 +406,15 @@ async def submit_final(request: SubmitFinalRequest):
             marc_fields=request.marc_fields
         )
         
-        # Save to JSON
-        file_path = settings.data_dir / f"{record_uuid}.json"
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(record.model_dump(), f, indent=2, ensure_ascii=False)
+        # Append to today's shard in the background
+        file_path = _records_shard_path()
+        _pending_writes += 1
+        background_tasks.add_task(_persist_record, file_path, record)
         
         return SubmitFinalResponse(
             success=True,
             uuid=record_uuid,
-            file_path=str(file_path),
+            file_path=file_path,
             message="Record saved successfully"
         )
         
@@ -285,7 +427,8 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "authority_search_connected": authority_search.client is not None
+        "authority_search_connected": authority_search.is_ready(),
+        "pending_record_writes": _pending_writes
     }
 
 
@@ -294,7 +437,11 @@ async def authority_stats():
     """Get statistics about all authority indexes."""
     try:
         stats = authority_search.get_stats()
-        return {"success": True, "stats": stats}
+        return {
+            "success": True,
+            "stats": stats,
+            "query_cache": authority_search.query_cache.stats()
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
@@ -303,9 +450,7 @@ async def authority_stats():
 async def initialize_authorities():
     """Initialize authority schemas in Weaviate (admin endpoint)."""
     try:
-        # Use existing connection from global instance
-        if not authority_search.client:
-            authority_search.connect()
+        # Uses the long-lived connection opened at startup
         authority_search.initialize_schemas()
         return {"success": True, "message": "Authority schemas initialized"}
     except Exception as e:
@@ -334,11 +479,11 @@ async def index_sample_authorities():
             {"label": "China", "uri": "(OCoLC)fst01206073"},
         ]
         
-        # Use existing connection from global instance
-        if not authority_search.client:
-            authority_search.connect()
-        authority_search.batch_index_authorities(lcsh_samples, "lcsh")
-        authority_search.batch_index_authorities(fast_samples, "fast")
+        # LCSH and FAST go to separate collections - index them concurrently
+        await asyncio.gather(
+            asyncio.to_thread(authority_search.batch_index_authorities, lcsh_samples, "lcsh"),
+            asyncio.to_thread(authority_search.batch_index_authorities, fast_samples, "fast")
+        )
         
         return {
             "success": True,
@@ -349,7 +494,47 @@ async def index_sample_authorities():
         raise HTTPException(status_code=500, detail=f"Indexing failed: {str(e)}")
 
 
-@router.post("/enhanced-search")
+def _build_marc(result) -> dict:
+    """
+    Convert a single authority search result into a MARC 65X response dict.
+    
+    Subfields are kept as (code, value) tuples while the field is assembled
+    and only expanded into dicts for the response.
+    """
+    # Determine MARC tag
+    tag = TAG_BY_SUBJECT_TYPE.get(getattr(result, 'subject_type', 'topical'), '650')
+    
+    # Determine second indicator
+    vocab = result.vocabulary.lower()
+    ind2 = VOCAB_IND2.get(vocab, '7')
+    
+    # Parse heading into subfields (cached per heading)
+    heading = result.label
+    subfields = list(parse_heading_subfields(heading))
+    
+    if result.uri:
+        subfields.append(("0", result.uri))
+    
+    if vocab != 'lcsh':
+        subfields.append(("2", vocab))
+    
+    # Build MARC string
+    marc_string = f"{tag} _{ind2}" + "".join(f" ${code} {value}" for code, value in subfields) + "."
+    
+    return {
+        "tag": tag,
+        "ind1": "_",
+        "ind2": ind2,
+        "subfields": [{"code": code, "value": value} for code, value in subfields],
+        "vocabulary": vocab,
+        "uri": result.uri,
+        "score": result.score,
+        "label": result.label,
+        "marc_string": marc_string
+    }
+
+
+@router.post("/enhanced-search", dependencies=[Depends(require_authority_search)])
 async def enhanced_search(
     title: str = Form(""),
     author: str = Form(""),
@@ -421,10 +606,6 @@ async def enhanced_search(
         if not rich_query:
             raise HTTPException(status_code=400, detail="Please provide at least one input field")
         
-        # Connect to authority search
-        if not authority_search.client:
-            authority_search.connect()
-        
         # Search authorities
         results = await authority_search.search_authorities(
             topic=rich_query,
@@ -434,63 +615,7 @@ async def enhanced_search(
         )
         
         # Convert to MARC 65X
-        marc_fields = []
-        for result in results:
-            # Determine MARC tag
-            subject_type = getattr(result, 'subject_type', 'topical')
-            if subject_type == 'geographic':
-                tag = '651'
-            elif subject_type == 'genre_form':
-                tag = '655'
-            else:
-                tag = '650'
-            
-            # Determine second indicator
-            vocab = result.vocabulary.lower()
-            ind2 = '0' if vocab == 'lcsh' else '7'
-            
-            # Parse heading into subfields
-            heading = result.label
-            subfields = []
-            
-            if '--' in heading:
-                parts = heading.split('--')
-                subfields.append({"code": "a", "value": parts[0]})
-                
-                for part in parts[1:]:
-                    if any(keyword in part.lower() for keyword in ['century', 'b.c.', 'a.d.']) or ('-' in part and any(char.isdigit() for char in part)):
-                        code = 'y'
-                    elif part[0].isupper() and not any(keyword in part.lower() for keyword in ['history', 'politics', 'social', 'conditions', 'civilization']):
-                        code = 'z'
-                    else:
-                        code = 'x'
-                    subfields.append({"code": code, "value": part})
-            else:
-                subfields.append({"code": "a", "value": heading})
-            
-            if result.uri:
-                subfields.append({"code": "0", "value": result.uri})
-            
-            if vocab != 'lcsh':
-                subfields.append({"code": "2", "value": vocab})
-            
-            # Build MARC string
-            marc_string = f"{tag} _{ind2}"
-            for sf in subfields:
-                marc_string += f" ${sf['code']} {sf['value']}"
-            marc_string += "."
-            
-            marc_fields.append({
-                "tag": tag,
-                "ind1": "_",
-                "ind2": ind2,
-                "subfields": subfields,
-                "vocabulary": vocab,
-                "uri": result.uri,
-                "score": result.score,
-                "label": result.label,
-                "marc_string": marc_string
-            })
+        marc_fields = [_build_marc(result) for result in results]
         
         return {
             "success": True,
@@ -24,14 +24,19 @@ Usage:
     python scripts/lcsh_importer_v2.py --input data/lcsh_full.nt --resume logs/checkpoint.json
 """
 
+import re
 import sys
 import json
+import queue
+import hashlib
+import asyncio
 import logging
+import itertools
 import argparse
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
 
 try:
     from tqdm import tqdm
@@ -40,6 +45,12 @@ except ImportError:
     print("   Running without progress bars...")
     tqdm = lambda x, **kwargs: x
 
+try:
+    import ahocorasick
+except ImportError:
+    # Falls back to plain substring scans in LCSHParser
+    ahocorasick = None
+
 try:
     from rdflib import Graph, Namespace, URIRef, Literal
     from rdflib.namespace import SKOS, RDF
@@ -48,10 +59,20 @@ except ImportError:
     print("   Install with: pip install rdflib")
     sys.exit(1)
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    print("❌ pyarrow not installed")
+    print("   Install with: pip install pyarrow")
+    sys.exit(1)
+
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 from config import settings
 import weaviate
 from authority_search import authority_search
@@ -81,16 +102,145 @@ class LCSHAuthority:
     subject_type: str  # "topical", "geographic", "genre_form", "unknown"
     language: str = "en"
     vocabulary: str = "lcsh"
+    # Legacy comma-joined fields (first 3 terms), precomputed once at parse time
+    broader: str = field(init=False, default="")
+    narrower: str = field(init=False, default="")
+    
+    def __post_init__(self):
+        self.broader = ", ".join(self.broader_terms[:3])
+        self.narrower = ", ".join(self.narrower_terms[:3])
+
+
+# Columnar layout for parsed authorities (one Arrow column per LCSHAuthority field)
+AUTHORITY_SCHEMA = pa.schema([
+    ("uri", pa.string()),
+    ("label", pa.string()),
+    ("alt_labels", pa.list_(pa.string())),
+    ("broader_terms", pa.list_(pa.string())),
+    ("narrower_terms", pa.list_(pa.string())),
+    ("scope_note", pa.string()),
+    ("subject_type", pa.string()),
+    ("language", pa.string()),
+    ("vocabulary", pa.string()),
+    ("broader", pa.string()),
+    ("narrower", pa.string()),
+])
+
+
+class AuthorityTableBuilder:
+    """Collect LCSHAuthority records column by column and build an Arrow table once."""
+    
+    def __init__(self):
+        self.columns = {name: [] for name in AUTHORITY_SCHEMA.names}
+    
+    def append(self, authority: LCSHAuthority):
+        for name, column in self.columns.items():
+            column.append(getattr(authority, name))
+    
+    def __len__(self) -> int:
+        return len(self.columns["uri"])
+    
+    def build(self) -> pa.Table:
+        return pa.table(self.columns, schema=AUTHORITY_SCHEMA)
+
+
+# N-Triples line: <subject> <predicate> object .
+NTRIPLE_PATTERN = re.compile(r'^<([^>]+)> <([^>]+)> (.+) \.\s*$')
+
+# N-Triples object: <uri> or "literal" with optional @lang / ^^<datatype>
+NT_OBJECT_PATTERN = re.compile(r'^(?:<([^>]*)>|"((?:[^"\\]|\\.)*)"(?:@[\w-]+|\^\^<[^>]*>)?)$')
+
+# Escape sequences allowed in N-Triples literals
+NT_ESCAPE_PATTERN = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)')
+NT_ESCAPES = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
+
+
+# Subject type from URI in one regex pass. Genre/form patterns take priority over
+# geographic ones (each alternative is a lookahead over the whole URI); only
+# "geo" is case-insensitive, matching the original checks.
+URI_TYPE_PATTERN = re.compile(
+    r'(?=.*?(?P<genre_form>/genreForms/|/gf))|(?=.*?(?P<geographic>/names/|(?i:geo)))'
+)
+
+
+def _unescape_literal(value: str) -> str:
+    """Decode N-Triples escape sequences in a literal value."""
+    if '\\' not in value:
+        return value
+    
+    def replace(match):
+        esc = match.group(1)
+        if esc[0] in 'uU':
+            return chr(int(esc[1:], 16))
+        return NT_ESCAPES.get(esc, esc)
+    
+    return NT_ESCAPE_PATTERN.sub(replace, value)
 
 
 class LCSHParser:
     """Parse LCSH data from various RDF formats."""
     
+    # Full predicate URIs used when scanning N-Triples directly
+    RDF_TYPE = str(RDF.type)
+    SKOS_CONCEPT = str(SKOS.Concept)
+    SKOS_PREF_LABEL = str(SKOS.prefLabel)
+    SKOS_ALT_LABEL = str(SKOS.altLabel)
+    SKOS_BROADER = str(SKOS.broader)
+    SKOS_NARROWER = str(SKOS.narrower)
+    SKOS_SCOPE_NOTE = str(SKOS.scopeNote)
+    
+    # Label keywords for subject type detection
+    GENRE_KEYWORDS = [
+        'handbooks', 'manuals', 'directories', 'bibliographies',
+        'dictionaries', 'encyclopedias', 'periodicals', 'congresses',
+        'conference', 'proceedings', 'sources', 'collections',
+        'fiction', 'poetry', 'drama', 'essays'
+    ]
+    GEOGRAPHIC_PATTERNS = ['china', 'united states', 'japan', 'europe', 'asia']
+    
     def __init__(self):
         self.skos = SKOS
         self.rdf = RDF
+        self._keyword_automaton = self._build_keyword_automaton()
+    
+    def _build_keyword_automaton(self):
+        """Build one Aho-Corasick automaton over genre and geographic keywords."""
+        if ahocorasick is None:
+            return None
         
-    def detect_subject_type(self, uri: str, label: str, graph: Graph) -> str:
+        automaton = ahocorasick.Automaton()
+        for keyword in self.GENRE_KEYWORDS:
+            automaton.add_word(keyword, ("genre", keyword))
+        for pattern in self.GEOGRAPHIC_PATTERNS:
+            if pattern not in automaton:
+                automaton.add_word(pattern, ("geographic", pattern))
+        automaton.make_automaton()
+        return automaton
+    
+    def _scan_keywords(self, label_lower: str) -> Tuple[bool, int]:
+        """
+        Scan a lowercased label for keywords in a single pass.
+        
+        Returns:
+            (has_genre_keyword, end index of the first geographic match or -1)
+        """
+        if self._keyword_automaton is None:
+            has_genre = any(kw in label_lower for kw in self.GENRE_KEYWORDS)
+            geo_ends = [
+                label_lower.find(p) + len(p) - 1
+                for p in self.GEOGRAPHIC_PATTERNS if p in label_lower
+            ]
+            return has_genre, min(geo_ends, default=-1)
+        
+        geo_end = -1
+        for end, (category, _) in self._keyword_automaton.iter(label_lower):
+            if category == "genre":
+                return True, geo_end
+            if geo_end < 0:
+                geo_end = end
+        return False, geo_end
+        
+    def detect_subject_type(self, uri: str, label: str, graph: Optional[Graph]) -> str:
         """
         Detect subject type from URI, label, or RDF type.
         
@@ -99,23 +249,15 @@ class LCSHParser:
         - /subjects/geo... → geographic  
         - /genreForms/gf... → genre/form
         """
-        uri_str = str(uri)
-        
         # Check URI pattern
-        if '/genreForms/' in uri_str or '/gf' in uri_str:
-            return "genre_form"
-        if '/names/' in uri_str or 'geo' in uri_str.lower():
-            return "geographic"
-        
-        # Check label for genre indicators
-        genre_keywords = [
-            'handbooks', 'manuals', 'directories', 'bibliographies',
-            'dictionaries', 'encyclopedias', 'periodicals', 'congresses',
-            'conference', 'proceedings', 'sources', 'collections',
-            'fiction', 'poetry', 'drama', 'essays'
-        ]
+        uri_match = URI_TYPE_PATTERN.match(str(uri))
+        if uri_match and uri_match.lastgroup:
+            return uri_match.lastgroup
+        
+        # Check label for genre and geographic keywords in one pass
         label_lower = label.lower()
-        if any(kw in label_lower for kw in genre_keywords):
+        has_genre, geo_end = self._scan_keywords(label_lower)
+        if has_genre:
             return "genre_form"
         
         # Check for geographic indicators
@@ -123,9 +265,8 @@ class LCSHParser:
             # LCSH subdivisions: check if first part is a place
             first_part = label.split(' -- ')[0]
             if first_part[0].isupper() and len(first_part.split()) <= 3:
-                # Might be a place name
-                geographic_patterns = ['china', 'united states', 'japan', 'europe', 'asia']
-                if any(pattern in first_part.lower() for pattern in geographic_patterns):
+                # Might be a place name (geographic keyword inside the first part)
+                if 0 <= geo_end < len(label_lower.split(' -- ')[0]):
                     return "geographic"
         
         # Default to topical
@@ -135,7 +276,7 @@ class LCSHParser:
         self,
         filepath: str,
         limit: Optional[int] = None
-    ) -> List[LCSHAuthority]:
+    ) -> pa.Table:
         """
         Parse LCSH RDF file and extract complete authority records.
         
@@ -144,7 +285,7 @@ class LCSHParser:
             limit: Optional limit on number of records
             
         Returns:
-            List of LCSHAuthority objects
+            Arrow table with one row per authority (see AUTHORITY_SCHEMA)
         """
         logger.info(f"Parsing RDF file: {filepath}")
         
@@ -160,20 +301,33 @@ class LCSHParser:
         }
         rdf_format = format_map.get(file_ext, 'xml')
         
+        # N-Triples: scan the file directly instead of building an rdflib Graph
+        if rdf_format == 'nt':
+            authorities = AuthorityTableBuilder()
+            records = self._stream_ntriples(filepath)
+            for uri, props in tqdm(records, desc="Parsing authorities", unit="record"):
+                authority = self._build_authority(uri, props)
+                if authority is None:
+                    continue
+                authorities.append(authority)
+                if limit and len(authorities) >= limit:
+                    break
+            
+            logger.info(f"Successfully parsed {len(authorities)} authorities")
+            return authorities.build()
+        
         # Parse RDF graph
         g = Graph()
         logger.info(f"Loading RDF graph (format: {rdf_format})...")
         g.parse(filepath, format=rdf_format)
         logger.info(f"Loaded {len(g)} triples")
         
-        # Extract authorities
-        authorities = []
-        concepts = list(g.subjects(predicate=RDF.type, object=self.skos.Concept))
+        # Extract authorities (iterate lazily rather than materializing all concepts)
+        authorities = AuthorityTableBuilder()
+        concepts = g.subjects(predicate=RDF.type, object=self.skos.Concept)
         
         if limit:
-            concepts = concepts[:limit]
-        
-        logger.info(f"Found {len(concepts)} SKOS concepts")
+            concepts = itertools.islice(concepts, limit)
         
         for concept in tqdm(concepts, desc="Parsing authorities", unit="record"):
             try:
@@ -217,57 +371,147 @@ class LCSHParser:
                 continue
         
         logger.info(f"Successfully parsed {len(authorities)} authorities")
-        return authorities
+        return authorities.build()
+    
+    def _stream_ntriples(self, filepath: str) -> Iterator[Tuple[str, Dict[str, List[str]]]]:
+        """
+        Stream an N-Triples file and yield (subject, {predicate: [objects]}) groups.
+        
+        LOC dumps write all triples for a resource together, so a group is
+        emitted whenever the subject changes. Only one record is held in
+        memory at a time.
+        """
+        current_uri = None
+        props: Dict[str, List[str]] = {}
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                match = NTRIPLE_PATTERN.match(line)
+                if not match:
+                    continue
+                
+                subject, predicate, obj = match.groups()
+                obj_match = NT_OBJECT_PATTERN.match(obj)
+                if not obj_match:
+                    continue
+                
+                uri_value, literal_value = obj_match.groups()
+                value = uri_value if uri_value is not None else _unescape_literal(literal_value)
+                
+                if subject != current_uri:
+                    if current_uri is not None:
+                        yield current_uri, props
+                    current_uri = subject
+                    props = {}
+                
+                props.setdefault(predicate, []).append(value)
+        
+        if current_uri is not None:
+            yield current_uri, props
+    
+    def _build_authority(self, uri: str, props: Dict[str, List[str]]) -> Optional[LCSHAuthority]:
+        """Build an LCSHAuthority from a subject's grouped N-Triples properties."""
+        if self.SKOS_CONCEPT not in props.get(self.RDF_TYPE, []):
+            return None
+        
+        pref_labels = props.get(self.SKOS_PREF_LABEL)
+        if not pref_labels:
+            return None
+        
+        label = pref_labels[0]
+        scope_notes = props.get(self.SKOS_SCOPE_NOTE, [])
+        
+        return LCSHAuthority(
+            uri=uri,
+            label=label,
+            alt_labels=props.get(self.SKOS_ALT_LABEL, []),
+            broader_terms=props.get(self.SKOS_BROADER, []),
+            narrower_terms=props.get(self.SKOS_NARROWER, []),
+            scope_note="; ".join(scope_notes) if scope_notes else "",
+            subject_type=self.detect_subject_type(uri, label, None)
+        )
 
 
 class LCSHIndexer:
     """Index LCSH authorities into Weaviate with embeddings."""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
+    def __init__(self, max_concurrent_requests: int = 16, embedding_chunk_size: int = 100):
+        # One pooled HTTP/2 client for all embedding requests (keeps TLS connections alive)
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
+        self.openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=self.http_client
+        )
         self.embedding_model = settings.embedding_model
+        self.max_concurrent_requests = max_concurrent_requests
+        self.embedding_chunk_size = embedding_chunk_size
         self.processed_count = 0
         self.error_count = 0
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def close(self):
+        """Close the pooled OpenAI HTTP client."""
+        await self.openai_client.close()
         
-    def build_embedding_text(self, authority: LCSHAuthority) -> str:
+    def build_embedding_text(self, authority: Dict) -> str:
         """
         Build rich text for embedding generation.
         
         Concatenates: label + altLabels + broader + narrower + scopeNote
         """
-        parts = [authority.label]
+        parts = [authority["label"]]
         
-        if authority.alt_labels:
-            parts.extend(authority.alt_labels)
+        if authority["alt_labels"]:
+            parts.extend(authority["alt_labels"])
         
-        if authority.scope_note:
-            parts.append(authority.scope_note)
+        if authority["scope_note"]:
+            parts.append(authority["scope_note"])
         
         # Note: broader/narrower are URIs, not great for embedding
         # In production, would resolve to labels
         
         return " | ".join(parts)
     
-    def generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding using OpenAI text-embedding-3-large."""
+    async def _embed_chunk(self, chunk: List[str]) -> List[Optional[List[float]]]:
+        """Embed up to one request's worth of texts (None for each text on failure)."""
         try:
-            response = self.openai_client.embeddings.create(
+            response = await self.openai_client.embeddings.create(
                 model=self.embedding_model,
-                input=text
+                input=chunk
             )
-            return response.data[0].embedding
+            ordered = sorted(response.data, key=lambda d: d.index)
+            return [item.embedding for item in ordered]
         except Exception as e:
-            logger.error(f"Error generating embedding: {str(e)}")
-            return None
+            logger.error(f"Error generating embeddings for {len(chunk)} texts: {str(e)}")
+            return [None] * len(chunk)
     
-    def batch_index(
+    async def batch_index(
         self,
-        authorities: List[LCSHAuthority],
+        authorities: List[Dict],
         collection_name: str = "LCSHSubject"
     ) -> int:
         """
         Index a batch of authorities into Weaviate.
         
+        Runs as a two-stage pipeline: max_concurrent_requests embedder tasks
+        embed chunks of the batch and feed a bounded queue, while a worker
+        thread drains the queue into Weaviate's dynamic batch (the sync
+        batcher blocks when Weaviate pushes back, so it stays off the event
+        loop). OpenAI latency overlaps with Weaviate inserts, and the queue
+        bound keeps embeddings from running far ahead of the inserts.
+        
+        Args:
+            authorities: Authority rows (dicts keyed by AUTHORITY_SCHEMA columns)
+            collection_name: Target Weaviate collection
+        
         Returns:
             Number of successfully indexed records
         """
@@ -280,48 +524,61 @@ class LCSHIndexer:
             logger.error(f"Collection {collection_name} not found: {str(e)}")
             return 0
         
-        success_count = 0
+        # Stage 1 input: chunks of authorities, one embeddings request each
+        chunk_queue: asyncio.Queue = asyncio.Queue()
+        for start in range(0, len(authorities), self.embedding_chunk_size):
+            chunk_queue.put_nowait(authorities[start:start + self.embedding_chunk_size])
+        
+        # Stage 1 output / stage 2 input: (chunk, embeddings) pairs; thread-safe,
+        # since the inserting stage runs in a worker thread
+        vector_queue: queue.Queue = queue.Queue(maxsize=2 * self.max_concurrent_requests)
         
-        with collection.batch.dynamic() as batch:
-            for authority in authorities:
+        async def embedder():
+            while True:
                 try:
-                    # Build embedding text
-                    embedding_text = self.build_embedding_text(authority)
-                    
-                    # Generate embedding
-                    embedding = self.generate_embedding(embedding_text)
-                    if not embedding:
-                        self.error_count += 1
-                        continue
-                    
-                    # Prepare properties
-                    properties = {
-                        "label": authority.label,
-                        "uri": authority.uri,
-                        "vocabulary": authority.vocabulary,
-                        "subject_type": authority.subject_type,
-                        "alt_labels": authority.alt_labels,
-                        "broader_terms": authority.broader_terms,
-                        "narrower_terms": authority.narrower_terms,
-                        "scope_note": authority.scope_note,
-                        "language": authority.language,
-                        # Legacy fields for backward compatibility
-                        "broader": ", ".join(authority.broader_terms[:3]) if authority.broader_terms else "",
-                        "narrower": ", ".join(authority.narrower_terms[:3]) if authority.narrower_terms else ""
-                    }
-                    
-                    # Add to batch
-                    batch.add_object(
-                        properties=properties,
-                        vector=embedding
-                    )
+                    chunk = chunk_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                texts = [self.build_embedding_text(authority) for authority in chunk]
+                embeddings = await self._embed_chunk(texts)
+                # Blocks while the inserter is behind, so wait off the event loop
+                await asyncio.to_thread(vector_queue.put, (chunk, embeddings))
+        
+        def drain() -> int:
+            success_count = 0
+            with collection.batch.dynamic() as batch:
+                while True:
+                    item = vector_queue.get()
+                    if item is None:
+                        break
                     
-                    success_count += 1
-                    self.processed_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Error indexing {authority.uri}: {str(e)}")
-                    self.error_count += 1
+                    for authority, embedding in zip(*item):
+                        try:
+                            if not embedding:
+                                self.error_count += 1
+                                continue
+                            
+                            # Row columns (incl. legacy broader/narrower) map 1:1 to collection properties
+                            batch.add_object(
+                                properties=authority,
+                                vector=embedding
+                            )
+                            
+                            success_count += 1
+                            self.processed_count += 1
+                            
+                        except Exception as e:
+                            logger.warning(f"Error indexing {authority['uri']}: {str(e)}")
+                            self.error_count += 1
+            return success_count
+        
+        inserter = asyncio.create_task(asyncio.to_thread(drain))
+        try:
+            await asyncio.gather(*[embedder() for _ in range(self.max_concurrent_requests)])
+        finally:
+            # Sentinel: no more embeddings; waits for the batcher to flush
+            await asyncio.to_thread(vector_queue.put, None)
+            success_count = await inserter
         
         return success_count
     
@@ -349,6 +606,51 @@ class LCSHIndexer:
             return json.load(f)
 
 
+def authorities_cache_path(input_path: Path, limit: Optional[int]) -> Path:
+    """
+    Path of the Parquet cache of parsed authorities for an input file.
+    
+    The name is keyed by the input path, its mtime, --limit and the table
+    schema, so a changed input file or layout never reuses a stale cache.
+    """
+    stat = input_path.stat()
+    key_source = f"{input_path.resolve()}|{stat.st_mtime_ns}|{limit}|{AUTHORITY_SCHEMA}"
+    key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()[:12]
+    return input_path.with_name(f"{input_path.stem}.authorities.{key}.parquet")
+
+
+async def index_authorities(
+    indexer: LCSHIndexer,
+    authorities: pa.Table,
+    args: argparse.Namespace,
+    processed_uris: set
+):
+    """Index authorities in batches, saving checkpoints if requested."""
+    total_batches = (authorities.num_rows + args.batch_size - 1) // args.batch_size
+    all_processed_uris = list(processed_uris)
+    
+    async with indexer:
+        for batch_num in tqdm(range(total_batches), desc="Indexing batches", unit="batch"):
+            # Only the current batch is converted to Python objects
+            batch = authorities.slice(batch_num * args.batch_size, args.batch_size).to_pylist()
+            
+            # Index batch
+            success_count = await indexer.batch_index(batch)
+            
+            # Track processed URIs
+            all_processed_uris.extend([a["uri"] for a in batch])
+            
+            # Save checkpoint every 10 batches
+            if args.checkpoint and (batch_num + 1) % 10 == 0:
+                checkpoint_path = f"logs/checkpoint_batch_{batch_num + 1}.json"
+                indexer.save_checkpoint(checkpoint_path, all_processed_uris)
+            
+            logger.info(
+                f"Batch {batch_num + 1}/{total_batches}: "
+                f"{success_count}/{len(batch)} indexed successfully"
+            )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Import LCSH authority data into Weaviate',
@@ -389,6 +691,11 @@ Examples:
         action='store_true',
         help='Save checkpoints every 10 batches'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-parse the input even if a Parquet cache of parsed authorities exists'
+    )
     parser.add_argument(
         '--resume',
         type=str,
@@ -432,45 +739,31 @@ Examples:
             processed_uris = set(checkpoint.get('processed_uris', []))
             logger.info(f"Resuming from checkpoint: {len(processed_uris)} records already processed")
     
-    # Parse authorities
-    logger.info("\nParsing LCSH data...")
-    authorities = parser_obj.parse_rdf_file(args.input, limit=args.limit)
+    # Parse authorities (or load them from the Parquet cache of a previous run)
+    cache_path = authorities_cache_path(input_path, args.limit)
+    if cache_path.exists() and not args.no_cache:
+        logger.info(f"\nLoading parsed authorities from cache: {cache_path}")
+        authorities = pq.read_table(cache_path)
+    else:
+        logger.info("\nParsing LCSH data...")
+        authorities = parser_obj.parse_rdf_file(args.input, limit=args.limit)
+        if authorities.num_rows:
+            pq.write_table(authorities, cache_path)
+            logger.info(f"Cached parsed authorities: {cache_path}")
     
-    if not authorities:
+    if authorities.num_rows == 0:
         logger.error("No authorities found in input file")
         sys.exit(1)
     
     # Filter already processed
     if processed_uris:
-        authorities = [a for a in authorities if a.uri not in processed_uris]
-        logger.info(f"Filtering: {len(authorities)} remaining after checkpoint")
+        already_processed = pc.is_in(authorities["uri"], value_set=pa.array(list(processed_uris), pa.string()))
+        authorities = authorities.filter(pc.invert(already_processed))
+        logger.info(f"Filtering: {authorities.num_rows} remaining after checkpoint")
     
     # Index in batches
-    logger.info(f"\nIndexing {len(authorities)} authorities...")
-    
-    total_batches = (len(authorities) + args.batch_size - 1) // args.batch_size
-    all_processed_uris = list(processed_uris)
-    
-    for batch_num in tqdm(range(total_batches), desc="Indexing batches", unit="batch"):
-        start_idx = batch_num * args.batch_size
-        end_idx = min(start_idx + args.batch_size, len(authorities))
-        batch = authorities[start_idx:end_idx]
-        
-        # Index batch
-        success_count = indexer.batch_index(batch)
-        
-        # Track processed URIs
-        all_processed_uris.extend([a.uri for a in batch])
-        
-        # Save checkpoint every 10 batches
-        if args.checkpoint and (batch_num + 1) % 10 == 0:
-            checkpoint_path = f"logs/checkpoint_batch_{batch_num + 1}.json"
-            indexer.save_checkpoint(checkpoint_path, all_processed_uris)
-        
-        logger.info(
-            f"Batch {batch_num + 1}/{total_batches}: "
-            f"{success_count}/{len(batch)} indexed successfully"
-        )
+    logger.info(f"\nIndexing {authorities.num_rows} authorities...")
+    asyncio.run(index_authorities(indexer, authorities, args, processed_uris))
     
     # Final statistics
     logger.info("\n" + "=" * 60)
@@ -478,7 +771,7 @@ Examples:
     logger.info("=" * 60)
     logger.info(f"Total processed: {indexer.processed_count}")
     logger.info(f"Total errors: {indexer.error_count}")
-    logger.info(f"Success rate: {indexer.processed_count / len(authorities) * 100:.1f}%")
+    logger.info(f"Success rate: {indexer.processed_count / authorities.num_rows * 100:.1f}%")
     
     # Get Weaviate stats
     stats = authority_search.get_stats()
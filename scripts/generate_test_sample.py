@@ -11,101 +11,111 @@ Usage:
 
 import argparse
 from pathlib import Path
+from typing import Dict, Iterator, TextIO
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import SKOS, RDF
 
-def generate_test_lcsh(count: int = 100) -> Graph:
+LCSH_BASE = "http://id.loc.gov/authorities/subjects/"
+
+# N-Triples string escapes for literals
+NT_LITERAL_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+
+# Hand-crafted test subjects with various characteristics
+SAMPLE_SUBJECTS = [
+    {
+        "id": "sh85018909",
+        "label": "Calligraphy, Chinese",
+        "alt_labels": ["Chinese calligraphy", "Shufa"],
+        "broader": ["sh85023424"],
+        "narrower": ["sh85018910", "sh85018911"],
+        "scope": "Here are entered works on the art of writing Chinese characters.",
+        "type": "topical"
+    },
+    {
+        "id": "sh85018910",
+        "label": "Calligraphy, Chinese -- Ming-Qing dynasties, 1368-1912",
+        "alt_labels": ["Ming-Qing calligraphy"],
+        "broader": ["sh85018909"],
+        "narrower": [],
+        "scope": "Calligraphy from the Ming and Qing dynasties.",
+        "type": "topical"
+    },
+    {
+        "id": "sh85023424",
+        "label": "Calligraphy",
+        "alt_labels": ["Penmanship", "Handwriting art"],
+        "broader": [],
+        "narrower": ["sh85018909", "sh85023425"],
+        "scope": "General works on the art of beautiful writing.",
+        "type": "topical"
+    },
+    {
+        "id": "sh85026722",
+        "label": "China",
+        "alt_labels": ["People's Republic of China", "PRC", "Zhongguo"],
+        "broader": ["sh85044923"],  # Asia
+        "narrower": ["sh85026723", "sh85026724"],
+        "scope": "Works on China as a geographic entity.",
+        "type": "geographic"
+    },
+    {
+        "id": "sh85026723",
+        "label": "China -- History -- Ming dynasty, 1368-1644",
+        "alt_labels": ["Ming dynasty China"],
+        "broader": ["sh85026722"],
+        "narrower": [],
+        "scope": "Historical period of Ming dynasty rule.",
+        "type": "topical"
+    },
+    {
+        "id": "gf2014026068",
+        "label": "Handbooks and manuals",
+        "alt_labels": ["Manuals", "Guidebooks", "How-to books"],
+        "broader": [],
+        "narrower": [],
+        "scope": "Instructional works providing practical information.",
+        "type": "genre_form"
+    },
+    {
+        "id": "sh85011303",
+        "label": "Art, Chinese",
+        "alt_labels": ["Chinese art", "Art of China"],
+        "broader": ["sh85007488"],  # Art, Asian
+        "narrower": ["sh85018909"],
+        "scope": "Works on art originating in China.",
+        "type": "topical"
+    },
+    {
+        "id": "sh85013838",
+        "label": "Books",
+        "alt_labels": ["Publications", "Printed books"],
+        "broader": [],
+        "narrower": ["gf2014026068"],
+        "scope": "General works about books as physical objects.",
+        "type": "topical"
+    },
+]
+
+
+def iter_test_subjects(count: int = 100) -> Iterator[Dict]:
     """
-    Generate a test LCSH RDF graph with realistic data.
+    Yield realistic LCSH-like test subject records one at a time.
+    
+    The hand-crafted samples come first; synthetic subjects are built on
+    demand for the rest, so memory stays constant in count.
     
     Args:
         count: Number of test subjects to generate
-        
-    Returns:
-        RDF Graph with test data
-    """
-    g = Graph()
-    g.bind('skos', SKOS)
     
-    # Test subjects with various characteristics
-    test_subjects = [
-        {
-            "id": "sh85018909",
-            "label": "Calligraphy, Chinese",
-            "alt_labels": ["Chinese calligraphy", "Shufa"],
-            "broader": ["sh85023424"],
-            "narrower": ["sh85018910", "sh85018911"],
-            "scope": "Here are entered works on the art of writing Chinese characters.",
-            "type": "topical"
-        },
-        {
-            "id": "sh85018910",
-            "label": "Calligraphy, Chinese -- Ming-Qing dynasties, 1368-1912",
-            "alt_labels": ["Ming-Qing calligraphy"],
-            "broader": ["sh85018909"],
-            "narrower": [],
-            "scope": "Calligraphy from the Ming and Qing dynasties.",
-            "type": "topical"
-        },
-        {
-            "id": "sh85023424",
-            "label": "Calligraphy",
-            "alt_labels": ["Penmanship", "Handwriting art"],
-            "broader": [],
-            "narrower": ["sh85018909", "sh85023425"],
-            "scope": "General works on the art of beautiful writing.",
-            "type": "topical"
-        },
-        {
-            "id": "sh85026722",
-            "label": "China",
-            "alt_labels": ["People's Republic of China", "PRC", "Zhongguo"],
-            "broader": ["sh85044923"],  # Asia
-            "narrower": ["sh85026723", "sh85026724"],
-            "scope": "Works on China as a geographic entity.",
-            "type": "geographic"
-        },
-        {
-            "id": "sh85026723",
-            "label": "China -- History -- Ming dynasty, 1368-1644",
-            "alt_labels": ["Ming dynasty China"],
-            "broader": ["sh85026722"],
-            "narrower": [],
-            "scope": "Historical period of Ming dynasty rule.",
-            "type": "topical"
-        },
-        {
-            "id": "gf2014026068",
-            "label": "Handbooks and manuals",
-            "alt_labels": ["Manuals", "Guidebooks", "How-to books"],
-            "broader": [],
-            "narrower": [],
-            "scope": "Instructional works providing practical information.",
-            "type": "genre_form"
-        },
-        {
-            "id": "sh85011303",
-            "label": "Art, Chinese",
-            "alt_labels": ["Chinese art", "Art of China"],
-            "broader": ["sh85007488"],  # Art, Asian
-            "narrower": ["sh85018909"],
-            "scope": "Works on art originating in China.",
-            "type": "topical"
-        },
-        {
-            "id": "sh85013838",
-            "label": "Books",
-            "alt_labels": ["Publications", "Printed books"],
-            "broader": [],
-            "narrower": ["gf2014026068"],
-            "scope": "General works about books as physical objects.",
-            "type": "topical"
-        },
-    ]
+    Yields:
+        Subject dicts (id, label, alt_labels, broader, narrower, scope, type)
+    """
+    yield from SAMPLE_SUBJECTS[:count]
     
-    # Add more synthetic subjects to reach desired count
-    for i in range(len(test_subjects), count):
-        test_subjects.append({
+    # Synthetic subjects to reach desired count
+    for i in range(len(SAMPLE_SUBJECTS), count):
+        yield {
             "id": f"sh{85000000 + i:08d}",
             "label": f"Test Subject {i}",
             "alt_labels": [f"Alternative {i}", f"Variant {i}"],
@@ -113,10 +123,70 @@ def generate_test_lcsh(count: int = 100) -> Graph:
             "narrower": [],
             "scope": f"Synthetic test subject number {i}.",
             "type": "topical"
-        })
+        }
+
+
+def write_test_ntriples(count: int, out: TextIO) -> int:
+    """
+    Stream test LCSH data straight to an N-Triples file, bypassing rdflib.
+    
+    Args:
+        count: Number of test subjects to generate
+        out: Text stream to write to
+        
+    Returns:
+        Number of triples written
+    """
+    rdf_type = f"<{RDF.type}>"
+    concept = f"<{SKOS.Concept}>"
+    pref_label = f"<{SKOS.prefLabel}>"
+    alt_label = f"<{SKOS.altLabel}>"
+    broader = f"<{SKOS.broader}>"
+    narrower = f"<{SKOS.narrower}>"
+    scope_note = f"<{SKOS.scopeNote}>"
+    
+    def literal(value: str) -> str:
+        return f'"{value.translate(NT_LITERAL_ESCAPES)}"@en'
+    
+    triple_count = 0
+    for subj in iter_test_subjects(count):
+        uri = f"<{LCSH_BASE}{subj['id']}>"
+        
+        lines = [
+            f"{uri} {rdf_type} {concept} .\n",
+            f"{uri} {pref_label} {literal(subj['label'])} .\n"
+        ]
+        lines.extend(f"{uri} {alt_label} {literal(alt)} .\n" for alt in subj['alt_labels'])
+        lines.extend(f"{uri} {broader} <{LCSH_BASE}{b}> .\n" for b in subj['broader'])
+        lines.extend(f"{uri} {narrower} <{LCSH_BASE}{n}> .\n" for n in subj['narrower'])
+        if subj['scope']:
+            lines.append(f"{uri} {scope_note} {literal(subj['scope'])} .\n")
+        
+        # One write per subject
+        out.write("".join(lines))
+        triple_count += len(lines)
+    
+    return triple_count
+
+
+def generate_test_lcsh(count: int = 100) -> Graph:
+    """
+    Generate a test LCSH RDF graph with realistic data.
+    
+    Used for the xml/n3/turtle formats; N-Triples output is written directly
+    by write_test_ntriples.
+    
+    Args:
+        count: Number of test subjects to generate
+        
+    Returns:
+        RDF Graph with test data
+    """
+    g = Graph()
+    g.bind('skos', SKOS)
     
     # Build RDF graph
-    for subj in test_subjects[:count]:
+    for subj in iter_test_subjects(count):
         uri = URIRef(f"http://id.loc.gov/authorities/subjects/{subj['id']}")
         
         # Add type
@@ -177,17 +247,21 @@ def main():
     print(f"   Format: {args.format}")
     print(f"   Output: {args.output}")
     
-    # Generate graph
-    g = generate_test_lcsh(args.count)
-    
     # Create output directory
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Serialize to file
-    g.serialize(destination=str(output_path), format=args.format)
+    if args.format == 'nt':
+        # Line-based format: write triples directly
+        with open(output_path, 'w', encoding='utf-8') as f:
+            triple_count = write_test_ntriples(args.count, f)
+    else:
+        # Generate graph and serialize to file
+        g = generate_test_lcsh(args.count)
+        g.serialize(destination=str(output_path), format=args.format)
+        triple_count = len(g)
     
-    print(f"✅ Generated {len(g)} triples")
+    print(f"✅ Generated {triple_count} triples")
     print(f"✅ Saved to: {output_path}")
     print()
     print("📋 Next steps:")
@@ -12,28 +12,42 @@ Usage:
     python scripts/lcsh_importer_streaming.py --input subjects.nt --resume logs/checkpoint.json
 """
 
+import os
+import re
 import sys
+import mmap
 import json
 import logging
+import itertools
+import multiprocessing
 import argparse
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
-from collections import defaultdict
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 
 # Setup paths
 sys.path.append(str(Path(__file__).parent.parent))
 
 # Third-party imports
+import numpy as np
 from tqdm import tqdm
-from openai import OpenAI
+from openai import BadRequestError, OpenAI
 from dotenv import load_dotenv
-import os
+
+try:
+    import ahocorasick
+except ImportError:
+    # Falls back to a regex over the lowercased label in detect_subject_type
+    ahocorasick = None
 
 # Local imports
 from authority_search import authority_search
 from config import settings
+from embedding_cache import EMBEDDING_DTYPE, EmbeddingCache
 
 # Load environment
 load_dotenv()
@@ -53,6 +67,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# SKOS / MADS predicates read for each concept. Kept predicates are replaced by
+# these interned objects, so every stored key is one shared bytes object.
+P_PREF_LABEL = b'http://www.w3.org/2004/02/skos/core#prefLabel'
+P_ALT_LABEL = b'http://www.w3.org/2004/02/skos/core#altLabel'
+P_BROADER = b'http://www.w3.org/2004/02/skos/core#broader'
+P_NARROWER = b'http://www.w3.org/2004/02/skos/core#narrower'
+P_SCOPE_NOTE = b'http://www.w3.org/2004/02/skos/core#scopeNote'
+P_MADS_AUTH_LABEL = b'http://www.loc.gov/mads/rdf/v1#authoritativeLabel'
+P_MADS_VARIANT_LABEL = b'http://www.loc.gov/mads/rdf/v1#variantLabel'
+P_MADS_BROADER = b'http://www.loc.gov/mads/rdf/v1#hasBroaderAuthority'
+P_MADS_NARROWER = b'http://www.loc.gov/mads/rdf/v1#hasNarrowerAuthority'
+P_MADS_NOTE = b'http://www.loc.gov/mads/rdf/v1#note'
+
+KEEP_PREDICATES = {p: p for p in (
+    P_PREF_LABEL, P_ALT_LABEL, P_BROADER, P_NARROWER, P_SCOPE_NOTE,
+    P_MADS_AUTH_LABEL, P_MADS_VARIANT_LABEL, P_MADS_BROADER, P_MADS_NARROWER, P_MADS_NOTE
+)}
+
+# The file is parsed in large blocks with multiline regexes, so scanning for
+# lines of interest happens inside the regex engine instead of per-line Python.
+
+# rdf:type line for a SKOS concept (skos:Concept) or MADS authority (mads:Topic, ...)
+_CONCEPT_TYPE = rb'<[^>]*type>[ \t]+<[^>]*(?:Concept|/mads/rdf/v1#)[^>]*>'
+CONCEPT_TYPE_PATTERN = re.compile(rb'^<([^>]+)>[ \t]+' + _CONCEPT_TYPE, re.M)
+
+
+
+def _predicate_alternation(predicates) -> bytes:
+    """
+    Regex alternation matching exactly the given predicate URIs.
+    
+    Alternatives are factored by namespace (skos:(?:prefLabel|altLabel|...)),
+    so a line with any other predicate is rejected after one namespace
+    comparison instead of one per kept predicate.
+    """
+    by_namespace = {}
+    for predicate in predicates:
+        namespace, _, local_name = predicate.rpartition(b'#')
+        by_namespace.setdefault(namespace + b'#', []).append(re.escape(local_name))
+    return b'|'.join(
+        re.escape(namespace) + b'(?:' + b'|'.join(local_names) + b')'
+        for namespace, local_names in by_namespace.items()
+    )
+
+
+# Statement with a kept predicate: <subject> <predicate> (<uri> | "literal"[@lang | ^^<datatype>]) .
+# Triples with any other predicate never leave the regex engine.
+_KEPT_STATEMENT = (
+    rb'<(' + _predicate_alternation(KEEP_PREDICATES) + rb')>[ \t]+'
+    rb'(?:<([^>]+)>|"((?:[^"\\\n]|\\.)*)"(?:@[^ \t\n]+|\^\^[^ \t\n]+)?)[ \t]*\.'
+)
+KEPT_TRIPLE_PATTERN = re.compile(rb'^<([^>]+)>[ \t]+' + _KEPT_STATEMENT, re.M)
+
+# Either of the above in one scan (single-pass grouped parsing); the predicate
+# group is empty for an rdf:type concept line
+GROUPED_TRIPLE_PATTERN = re.compile(
+    rb'^<([^>]+)>[ \t]+(?:' + _CONCEPT_TYPE + rb'|' + _KEPT_STATEMENT + rb')',
+    re.M
+)
+
+# String escapes inside N-Triples literals (\" \\ \n \uXXXX \UXXXXXXXX ...)
+NT_ESCAPE_PATTERN = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))', re.S)
+NT_ECHARS = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
+
+BLOCK_SIZE = 8 << 20  # Bytes scanned per progress update
+
+# Properties are stored flat: (subject, predicate) -> objects
+PropertyMap = Dict[Tuple[bytes, bytes], List[bytes]]
+EMPTY = ()
+
 
 @dataclass
 class Authority:
@@ -74,293 +158,691 @@ class Authority:
             self.broader_terms = []
         if self.narrower_terms is None:
             self.narrower_terms = []
+    
+    def to_properties(self) -> Dict:
+        """Weaviate properties for this record (literal dict, no asdict reflection)."""
+        return {
+            "uri": self.uri,
+            "label": self.label,
+            "alt_labels": self.alt_labels,
+            "broader_terms": self.broader_terms,
+            "narrower_terms": self.narrower_terms,
+            "scope_note": self.scope_note,
+            "subject_type": self.subject_type,
+            "vocabulary": self.vocabulary,
+            "language": self.language
+        }
 
 
-def parse_ntriples_line(line: str) -> Optional[tuple]:
+@contextmanager
+def map_file(file_path: Path, start: int = 0, end: Optional[int] = None):
     """
-    Parse a single N-Triples line.
+    Memory-map a file read-only for a sequential scan of [start, end).
     
-    Returns: (subject, predicate, object) or None if invalid
+    Regexes run directly on the mapping (with pos/endpos), so no line or
+    block is ever copied into a Python bytes object. The kernel is told the
+    access pattern (sequential, whole range wanted) so readahead keeps ahead
+    of the scan. Yields b'' for an empty file, which cannot be mapped.
     """
-    line = line.strip()
-    if not line or line.startswith('#'):
-        return None
-    
-    try:
-        # Simple N-Triples parser (subject predicate object .)
-        parts = line.rstrip(' .').split(' ', 2)
-        if len(parts) != 3:
-            return None
+    with open(file_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size == 0:
+            yield b''
+            return
         
-        subject, predicate, obj = parts
+        end = file_size if end is None else end
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), start, end - start, os.POSIX_FADV_SEQUENTIAL)
         
-        # Remove angle brackets from URIs
-        subject = subject.strip('<>')
-        predicate = predicate.strip('<>')
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if hasattr(mmap, 'MADV_WILLNEED') and (start or end < file_size):
+                # Worker ranges: start reading this range in now (offset must be page aligned)
+                aligned = start - start % mmap.PAGESIZE
+                mm.madvise(mmap.MADV_WILLNEED, aligned, end - aligned)
+            yield mm
+        finally:
+            mm.close()
+
+
+def iter_blocks(buf, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """Yield line-aligned (block_start, block_end) windows covering [start, end) of buf."""
+    while start < end:
+        block_end = min(start + BLOCK_SIZE, end)
+        if block_end < end:
+            # Cut after the last newline (or, for a huge line, after the next one)
+            newline = buf.rfind(b'\n', start, block_end)
+            if newline < 0:
+                newline = buf.find(b'\n', block_end, end)
+            block_end = newline + 1 if newline >= 0 else end
+        yield start, block_end
+        start = block_end
+
+
+def scan_concepts_block(
+    buf,
+    start: int,
+    end: int,
+    concepts: Set[bytes],
+    max_concepts: Optional[int] = None
+) -> int:
+    """
+    Add the concept subjects typed in buf[start:end] to concepts.
+    
+    Returns:
+        Offset scanned up to: end, or the end of the line where max_concepts
+        was reached
+    """
+    for match in CONCEPT_TYPE_PATTERN.finditer(buf, start, end):
+        concepts.add(match.group(1))
+        if max_concepts and len(concepts) >= max_concepts:
+            line_end = buf.find(b'\n', match.end(), end)
+            return end if line_end < 0 else line_end + 1
+    return end
+
+
+def collect_properties_block(
+    buf,
+    start: int,
+    end: int,
+    concepts: Set[bytes],
+    uri_cache: Dict[bytes, bytes],
+    properties: PropertyMap
+):
+    """
+    Add the kept-predicate properties of known concepts in buf[start:end].
+    
+    Predicates are replaced by their interned constants; subjects and URI
+    objects are deduplicated through uri_cache, so each URI is stored once
+    however many properties (or broader/narrower links) refer to it.
+    """
+    intern_uri = uri_cache.setdefault
+    for subject, predicate, uri_obj, literal_obj in KEPT_TRIPLE_PATTERN.findall(buf, start, end):
+        if subject not in concepts:
+            continue
+        obj = intern_uri(uri_obj, uri_obj) if uri_obj else literal_obj
+        properties.setdefault((intern_uri(subject, subject), KEEP_PREDICATES[predicate]), []).append(obj)
+
+
+def split_byte_ranges(file_path: Path, chunks: int) -> List[Tuple[int, int]]:
+    """Split a file into roughly equal byte ranges aligned to line starts."""
+    file_size = file_path.stat().st_size
+    bounds = [0]
+    with map_file(file_path) as buf:
+        for i in range(1, chunks):
+            # Start of the next full line (find on the mapping, no buffered reads)
+            newline = buf.find(b'\n', file_size * i // chunks)
+            bounds.append(file_size if newline < 0 else newline + 1)
+    bounds.append(file_size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def _scan_concepts_range(task: Tuple[Path, int, int]) -> Set[bytes]:
+    """Worker: collect concept subjects in one byte range."""
+    file_path, start, end = task
+    concepts = set()
+    with map_file(file_path, start, end) as buf:
+        scan_concepts_block(buf, start, end, concepts)
+    return concepts
+
+
+# Concept URIs shared with property workers (set once per worker process)
+_worker_concepts: Set[bytes] = set()
+
+
+def _init_property_worker(concepts: Set[bytes]):
+    global _worker_concepts
+    _worker_concepts = concepts
+
+
+def _collect_properties_range(task: Tuple[Path, int, int]) -> PropertyMap:
+    """Worker: collect properties of known concepts in one byte range."""
+    file_path, start, end = task
+    properties = {}
+    uri_cache = {}
+    with map_file(file_path, start, end) as buf:
+        collect_properties_block(buf, start, end, _worker_concepts, uri_cache, properties)
+    return properties
+
+
+def parse_sequential(file_path: Path, limit: int = None):
+    """
+    Parse concepts and their properties in a single process.
+    
+    Supports --limit: both passes stop at the line where enough concepts were seen.
+    Progress is reported per block.
         
-        # Handle objects (URI or literal)
-        if obj.startswith('<'):
-            obj = obj.strip('<>')
-        elif obj.startswith('"'):
-            # Extract literal value (simple approach)
-            if '@' in obj:
-                obj = obj.split('@')[0].strip('"')
-            elif '^^' in obj:
-                obj = obj.split('^^')[0].strip('"')
-            else:
-                obj = obj.strip('"')
+    Returns:
+        (skos_concepts, properties, bytes_scanned)
+    """
+    file_size = file_path.stat().st_size
+    properties: PropertyMap = {}
+    
+    # First pass: only collect concept URIs from rdf:type lines
+    # (the file is read as bytes; only values that end up in an Authority are decoded)
+    skos_concepts = set()
+    max_concepts = limit * 5 if limit else None  # Buffer: many concepts lack labels
+    scan_end = 0
+    uri_cache = {}
+    
+    with map_file(file_path) as buf:
+        with tqdm(total=file_size, desc="Scanning concepts", unit="B", unit_scale=True) as pbar:
+            for start, end in iter_blocks(buf, 0, file_size):
+                scan_end = scan_concepts_block(buf, start, end, skos_concepts, max_concepts)
+                pbar.update(scan_end - start)
+                
+                # Stop if we have enough concepts
+                if max_concepts and len(skos_concepts) >= max_concepts:
+                    break
         
-        return (subject, predicate, obj)
-    except Exception as e:
-        logger.debug(f"Failed to parse line: {line[:100]}... Error: {e}")
-        return None
+        # Second pass: store properties for concept subjects only (same byte range)
+        with tqdm(total=scan_end, desc="Reading properties", unit="B", unit_scale=True) as pbar:
+            for start, end in iter_blocks(buf, 0, scan_end):
+                collect_properties_block(buf, start, end, skos_concepts, uri_cache, properties)
+                pbar.update(end - start)
+    
+    return skos_concepts, properties, scan_end
+
+
+def parse_parallel(file_path: Path, workers: int):
+    """
+    Parse concepts and their properties across worker processes.
+    
+    Every N-Triples line is independent, so the file is split into
+    line-aligned byte ranges and each pass maps over them with a Pool.
+    
+    Returns:
+        (skos_concepts, properties, bytes_scanned)
+    """
+    tasks = [(file_path, start, end) for start, end in split_byte_ranges(file_path, workers * 4)]
+    
+    # First pass: union of per-range concept sets
+    skos_concepts = set()
+    with multiprocessing.Pool(workers) as pool:
+        for concepts in tqdm(pool.imap_unordered(_scan_concepts_range, tasks),
+                             total=len(tasks), desc="Scanning concepts", unit=" chunk"):
+            skos_concepts |= concepts
+    
+    # Second pass: merge per-range properties in file order
+    properties: PropertyMap = {}
+    with multiprocessing.Pool(workers, initializer=_init_property_worker, initargs=(skos_concepts,)) as pool:
+        for chunk_properties in tqdm(pool.imap(_collect_properties_range, tasks),
+                                     total=len(tasks), desc="Reading properties", unit=" chunk"):
+            for key, objs in chunk_properties.items():
+                existing = properties.get(key)
+                if existing is None:
+                    properties[key] = objs
+                else:
+                    existing.extend(objs)
+    
+    return skos_concepts, properties, file_path.stat().st_size
+
+
+def _unescape(match: re.Match) -> str:
+    code = match.group(1) or match.group(2)
+    if code:
+        return chr(int(code, 16))
+    return NT_ECHARS.get(match.group(3), match.group(0))
+
+
+def decode_literal(value: bytes) -> str:
+    """Decode a raw N-Triples literal body to text, resolving string escapes."""
+    text = value.decode('utf-8')
+    if '\\' not in text:
+        return text  # Common case: nothing to unescape
+    return NT_ESCAPE_PATTERN.sub(_unescape, text)
+
+
+def build_authority(uri: bytes, properties: PropertyMap) -> Optional[Authority]:
+    """
+    Build the Authority for a concept, popping its entries from properties.
+    
+    Returns:
+        Authority, or None if the concept has no label
+    """
+    pop = properties.pop
+    
+    def take(predicate: bytes, fallback: bytes):
+        # Pop both the SKOS property and its MADS equivalent, preferring SKOS
+        primary = pop((uri, predicate), None)
+        secondary = pop((uri, fallback), None)
+        return primary or secondary or EMPTY
+    
+    # Extract label (SKOS prefLabel OR MADS authoritativeLabel)
+    labels = take(P_PREF_LABEL, P_MADS_AUTH_LABEL)
+    
+    # Extract altLabels (SKOS altLabel OR MADS variants)
+    alt_labels = take(P_ALT_LABEL, P_MADS_VARIANT_LABEL)
+    
+    # Extract broader/narrower terms (SKOS or MADS)
+    broader = take(P_BROADER, P_MADS_BROADER)
+    narrower = take(P_NARROWER, P_MADS_NARROWER)
+    
+    # Extract scope note (SKOS or MADS)
+    scope_notes = take(P_SCOPE_NOTE, P_MADS_NOTE)
+    
+    if not labels:
+        return None  # Skip if no label
+    
+    label = decode_literal(labels[0])
+    scope_note = decode_literal(scope_notes[0]) if scope_notes else ""
+    
+    uri = uri.decode('utf-8')
+    
+    # Detect subject type
+    subject_type = detect_subject_type(uri, label)
+    
+    return Authority(
+        uri=uri,
+        label=label,
+        alt_labels=[decode_literal(v) for v in alt_labels],
+        broader_terms=[v.decode('utf-8') for v in broader],
+        narrower_terms=[v.decode('utf-8') for v in narrower],
+        scope_note=scope_note,
+        subject_type=subject_type,
+        vocabulary="lcsh"
+    )
+
+
+def stream_grouped(file_path: Path, limit: int = None) -> Iterator[Authority]:
+    """
+    Single-pass parse of a subject-grouped N-Triples file.
+    
+    LC bulk dumps write each record's triples together, so a subject not
+    seen for a whole block (8 MiB) is complete: its Authority is yielded
+    and its properties released. Memory is bounded by the subjects touched
+    in the last two blocks instead of every concept in the file, and
+    parsing overlaps with indexing from the first block.
+    
+    Args:
+        file_path: Path to .nt file
+        limit: Maximum number of authorities to yield
+    
+    Yields:
+        Authority records
+    """
+    file_size = file_path.stat().st_size
+    properties: PropertyMap = {}
+    # subject -> [last block seen, is concept], least recently seen first
+    open_subjects: "OrderedDict[bytes, List]" = OrderedDict()
+    uri_cache = {}
+    count = 0
+    
+    def flush(before_block: int) -> Iterator[Authority]:
+        # Release subjects not seen since before_block
+        while open_subjects:
+            subject, (last_block, is_concept) = next(iter(open_subjects.items()))
+            if last_block >= before_block:
+                break
+            del open_subjects[subject]
+            if is_concept:
+                authority = build_authority(subject, properties)
+                if authority is not None:
+                    yield authority
+            else:
+                for predicate in KEEP_PREDICATES:
+                    properties.pop((subject, predicate), None)
+    
+    with map_file(file_path) as buf:
+        with tqdm(total=file_size, desc="Parsing (grouped)", unit="B", unit_scale=True) as pbar:
+            for block, (start, end) in enumerate(iter_blocks(buf, 0, file_size)):
+                for subject, predicate, uri_obj, literal_obj in GROUPED_TRIPLE_PATTERN.findall(buf, start, end):
+                    state = open_subjects.get(subject)
+                    if state is None:
+                        state = open_subjects[subject] = [block, False]
+                    elif state[0] != block:
+                        state[0] = block
+                        open_subjects.move_to_end(subject)
+                    
+                    if not predicate:
+                        state[1] = True  # rdf:type concept line
+                        continue
+                    obj = uri_cache.setdefault(uri_obj, uri_obj) if uri_obj else literal_obj
+                    properties.setdefault((subject, KEEP_PREDICATES[predicate]), []).append(obj)
+                pbar.update(end - start)
+                
+                # URI dedup only needs to span the open window
+                if len(uri_cache) > 1 << 20:
+                    uri_cache.clear()
+                
+                for authority in flush(block):
+                    yield authority
+                    count += 1
+                    if limit and count >= limit:
+                        return
+            
+            for authority in flush(sys.maxsize):
+                yield authority
+                count += 1
+                if limit and count >= limit:
+                    return
 
 
-def stream_ntriples(file_path: Path, limit: int = None) -> Dict[str, Authority]:
+def stream_ntriples(
+    file_path: Path,
+    limit: int = None,
+    workers: int = 1,
+    grouped: bool = False
+) -> Iterator[Authority]:
     """
     Stream parse N-Triples file line by line.
     
+    Authorities are yielded one at a time as they are built, and each
+    concept's properties are released once its Authority is yielded.
+    
     Args:
         file_path: Path to .nt file
         limit: Maximum number of concepts to extract
+        workers: Parser processes (full-file parses only; --limit runs sequentially)
+        grouped: Input keeps each subject's triples together (LC bulk dumps);
+            parse in one bounded-memory pass instead of two
         
-    Returns:
-        Dictionary of URI -> Authority
+    Yields:
+        Authority records
     """
-    authorities = {}
-    properties = defaultdict(lambda: defaultdict(list))
-    
     logger.info(f"Streaming N-Triples file: {file_path}")
     logger.info(f"File size: {file_path.stat().st_size / 1024 / 1024:.1f} MB")
     
-    # First pass: collect all triples
-    total_lines = 0
-    skos_concepts = set()
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in tqdm(f, desc="Reading file", unit=" lines", mininterval=1):
-            total_lines += 1
-            
-            triple = parse_ntriples_line(line)
-            if not triple:
-                continue
-            
-            subject, predicate, obj = triple
-            
-            # Track SKOS concepts OR MADS topics/names/etc
-            if predicate.endswith('type') and ('Concept' in obj or '/mads/rdf/v1#' in obj):
-                # SKOS: skos:Concept
-                # MADS: mads:Topic, mads:Geographic, mads:GenreForm, mads:Temporal
-                skos_concepts.add(subject)
-            
-            # Store properties
-            properties[subject][predicate].append(obj)
-            
-            # Stop if we have enough concepts
-            # Use larger buffer since many concepts lack labels
-            if limit and len(skos_concepts) >= limit * 5:  # Buffer for filtering
-                break
-    
-    logger.info(f"Read {total_lines:,} lines")
+    count = 0
+    if grouped:
+        for authority in stream_grouped(file_path, limit):
+            yield authority
+            count += 1
+        logger.info(f"Successfully built {count:,} authority records")
+        return
+    
+    if workers > 1 and not limit:
+        skos_concepts, properties, bytes_scanned = parse_parallel(file_path, workers)
+    else:
+        skos_concepts, properties, bytes_scanned = parse_sequential(file_path, limit)
+    
+    logger.info(f"Scanned {bytes_scanned / 1024 / 1024:.1f} MB")
     logger.info(f"Found {len(skos_concepts):,} SKOS/MADS concepts")
+    logger.info(f"Collected {len(properties):,} concept properties")
     
-    # Second pass: build Authority objects
-    count = 0
+    # Build Authority objects
     for uri in tqdm(skos_concepts, desc="Building authorities", unit=" concept"):
         if limit and count >= limit:
             break
         
-        props = properties[uri]
-        
-        # Extract label (SKOS prefLabel OR MADS authoritativeLabel)
-        labels = props.get('http://www.w3.org/2004/02/skos/core#prefLabel', [])
-        if not labels:
-            # Try MADS authoritativeLabel
-            auth_labels = props.get('http://www.loc.gov/mads/rdf/v1#authoritativeLabel', [])
-            if auth_labels:
-                labels = auth_labels
-        
-        if not labels:
-            continue  # Skip if no label
-        
-        label = labels[0] if labels else ""
-        
-        # Extract altLabels (SKOS altLabel OR MADS variants)
-        alt_labels = props.get('http://www.w3.org/2004/02/skos/core#altLabel', [])
-        if not alt_labels:
-            # Try MADS variantLabel
-            alt_labels = props.get('http://www.loc.gov/mads/rdf/v1#variantLabel', [])
-        
-        # Extract broader/narrower terms (SKOS or MADS)
-        broader = [t for t in props.get('http://www.w3.org/2004/02/skos/core#broader', [])]
-        if not broader:
-            broader = [t for t in props.get('http://www.loc.gov/mads/rdf/v1#hasBroaderAuthority', [])]
-        
-        narrower = [t for t in props.get('http://www.w3.org/2004/02/skos/core#narrower', [])]
-        if not narrower:
-            narrower = [t for t in props.get('http://www.loc.gov/mads/rdf/v1#hasNarrowerAuthority', [])]
+        authority = build_authority(uri, properties)
+        if authority is None:
+            continue
         
-        # Extract scope note (SKOS or MADS)
-        scope_notes = props.get('http://www.w3.org/2004/02/skos/core#scopeNote', [])
-        if not scope_notes:
-            # Try MADS note
-            scope_notes = props.get('http://www.loc.gov/mads/rdf/v1#note', [])
-        scope_note = scope_notes[0] if scope_notes else ""
-        
-        # Detect subject type
-        subject_type = detect_subject_type(uri, label)
-        
-        authority = Authority(
-            uri=uri,
-            label=label,
-            alt_labels=alt_labels,
-            broader_terms=broader,
-            narrower_terms=narrower,
-            scope_note=scope_note,
-            subject_type=subject_type,
-            vocabulary="lcsh"
-        )
-        
-        authorities[uri] = authority
+        yield authority
         count += 1
     
-    logger.info(f"Successfully built {len(authorities):,} authority records")
+    logger.info(f"Successfully built {count:,} authority records")
+
+
+# Subject type heuristics, compiled once instead of scanned per keyword
+GENRE_KEYWORDS = (
+    'fiction', 'poetry', 'drama', 'handbooks', 'manuals',
+    'dictionaries', 'encyclopedias', 'periodicals', 'newspapers'
+)
+_GEO_URI_RE = re.compile(r'geo', re.IGNORECASE)
+_PLACE_RE = re.compile(r'China|Japan|United States|Europe|Asia|Africa')
+
+
+def _build_genre_matcher():
+    """
+    Return a predicate for "lowercased label contains a genre keyword".
     
-    return authorities
+    Uses one Aho-Corasick pass over the label when pyahocorasick is
+    installed; otherwise a case-sensitive regex alternation (much faster
+    than re.IGNORECASE on the original label).
+    """
+    if ahocorasick is None:
+        return re.compile('|'.join(GENRE_KEYWORDS)).search
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in GENRE_KEYWORDS:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return lambda label_lower: next(automaton.iter(label_lower), None) is not None
+
+
+_has_genre_keyword = _build_genre_matcher()
 
 
 def detect_subject_type(uri: str, label: str) -> str:
     """Detect subject type from URI and label."""
     # Geographic indicators
-    if '/names/' in uri or 'geo' in uri.lower():
+    if '/names/' in uri or _GEO_URI_RE.search(uri):
         return "geographic"
     
     # Genre/form indicators
-    genre_keywords = [
-        'fiction', 'poetry', 'drama', 'handbooks', 'manuals',
-        'dictionaries', 'encyclopedias', 'periodicals', 'newspapers'
-    ]
-    if any(kw in label.lower() for kw in genre_keywords):
+    if _has_genre_keyword(label.lower()):
         return "genre_form"
     
-    # Geographic patterns in label
-    if ' -- ' in label:
-        parts = label.split(' -- ')
-        # Common place name patterns
-        place_indicators = ['China', 'Japan', 'United States', 'Europe', 'Asia', 'Africa']
-        if any(place in parts[0] for place in place_indicators):
-            return "geographic"
+    # Geographic patterns in the first subdivision of the label
+    head, sep, _ = label.partition(' -- ')
+    if sep and _PLACE_RE.search(head):
+        return "geographic"
     
     return "topical"
 
 
-def generate_embedding(text: str, client: OpenAI) -> List[float]:
-    """Generate embedding using OpenAI API."""
+def build_embedding_text(auth: Authority) -> str:
+    """Build the text embedded for an authority (label + altLabels + scope note)."""
+    embedding_text = auth.label
+    if auth.alt_labels:
+        embedding_text += " | " + " | ".join(auth.alt_labels[:3])
+    if auth.scope_note:
+        embedding_text += " | " + auth.scope_note[:200]
+    return embedding_text
+
+
+def generate_embeddings(texts: List[str], client: OpenAI) -> List[Optional[np.ndarray]]:
+    """
+    Generate embeddings for a batch of texts in one OpenAI API request.
+    
+    Transient failures (429s, connection errors, 5xx) are retried with
+    backoff by the client; a rejected request is split in half and retried,
+    so one bad text gets None instead of failing the rest of its batch.
+    
+    Vectors are returned as EMBEDDING_DTYPE (float16) arrays: 6 KB per
+    3072-dim embedding while batches wait for insert, and identical whether
+    they came from OpenAI or the embedding cache.
+    """
     try:
         response = client.embeddings.create(
             model="text-embedding-3-large",
-            input=text
+            input=texts
         )
-        return response.data[0].embedding
+        # Results carry an index; order them to match the input
+        return [
+            np.asarray(d.embedding, dtype=EMBEDDING_DTYPE)
+            for d in sorted(response.data, key=lambda d: d.index)
+        ]
+    except BadRequestError as e:
+        if len(texts) == 1:
+            logger.error(f"Embedding rejected for text {texts[0][:100]!r}: {e}")
+            return [None]
+        # One bad input rejects the whole request: retry each half until
+        # only the offending text is left without a vector
+        logger.warning(f"Embedding request for {len(texts)} texts rejected, splitting: {e}")
+        middle = len(texts) // 2
+        return generate_embeddings(texts[:middle], client) + generate_embeddings(texts[middle:], client)
     except Exception as e:
         logger.error(f"Embedding generation failed: {e}")
         raise
 
 
-def batch_index_authorities(authorities: Dict[str, Authority], batch_size: int = 100):
-    """Batch index authorities into Weaviate with embeddings."""
-    from weaviate.classes.data import DataObject
+def batch_index_authorities(
+    authorities: Iterable[Authority],
+    batch_size: int = 512,
+    embed_workers: int = 8,
+    max_pending: Optional[int] = None,
+    embedding_cache: Optional[EmbeddingCache] = None
+):
+    """
+    Batch index authorities into Weaviate with embeddings.
+    
+    Authorities are consumed lazily in batches, so indexing starts as soon
+    as the first batch has been parsed. Embeddings for upcoming batches are
+    generated on a thread pool while the current batch is inserted.
+    
+    Args:
+        authorities: Iterable of Authority records (e.g. from stream_ntriples)
+        batch_size: Authorities per embeddings request / insert
+        embed_workers: Concurrent embeddings requests
+        max_pending: Maximum batches embedded ahead of the inserter
+            (default: twice embed_workers, so no worker waits on the inserter)
+        embedding_cache: Optional on-disk cache consulted before calling OpenAI
+        
+    Returns:
+        (success_count, errors, total_count) where total_count includes
+        authorities skipped as duplicates
+    """
     import weaviate.classes as wvc
+    from weaviate.util import generate_uuid5
     
-    client = OpenAI(api_key=settings.openai_api_key)
+    # Rate-limited (429) requests are retried by the SDK with exponential
+    # backoff that honours Retry-After
+    client = OpenAI(api_key=settings.openai_api_key, max_retries=6)
     authority_search.connect()
     
     collection = authority_search.client.collections.get("LCSHSubject")
     
-    # Get existing URIs to avoid duplicates (using iterator for large datasets)
-    logger.info("Checking for existing records...")
-    existing_uris = set()
+    # One aggregate count up front: a fresh collection (the usual first
+    # import) has nothing to skip, so its batches skip the existence lookups
     try:
-        # Use iterator to handle large result sets
-        for item in collection.iterator(
-            return_properties=["uri"]
-        ):
-            existing_uris.add(item.properties.get("uri"))
-        logger.info(f"Found {len(existing_uris)} existing records - will skip duplicates")
+        existing_count = collection.aggregate.over_all(total_count=True).total_count
+        logger.info(f"Found {existing_count} existing records - will skip duplicates")
     except Exception as e:
-        logger.warning(f"Could not fetch existing URIs: {e}")
-    
-    # Filter out existing authorities
-    authority_list = [auth for auth in authorities.values() if auth.uri not in existing_uris]
-    logger.info(f"Importing {len(authority_list)} new records (skipping {len(authorities) - len(authority_list)} duplicates)")
+        logger.warning(f"Could not count existing records: {e}")
+        existing_count = None
     
-    if not authority_list:
-        logger.info("No new records to import!")
-        authority_search.client.close()
-        return 0, []
-    
-    total_batches = (len(authority_list) + batch_size - 1) // batch_size
+    total_count = 0
+    new_count = 0
     errors = []
     
-    for i in tqdm(range(0, len(authority_list), batch_size), 
-                  desc="Indexing batches", unit="batch"):
-        batch = authority_list[i:i + batch_size]
+    def counted_authorities() -> Iterator[Authority]:
+        nonlocal total_count
+        for auth in authorities:
+            total_count += 1
+            yield auth
+    
+    def drop_existing(batch: List[Authority]) -> List[Authority]:
+        # Objects are keyed by uuid5(uri), so one lookup by ID per batch finds
+        # the URIs already imported, without scanning the collection
+        ids = [generate_uuid5(auth.uri) for auth in batch]
+        try:
+            response = collection.query.fetch_objects_by_ids(ids, limit=len(ids), return_properties=["uri"])
+        except Exception as e:
+            logger.warning(f"Could not check for existing records: {e}")
+            return batch
+        existing = {str(obj.uuid) for obj in response.objects}
+        return [auth for auth, uuid in zip(batch, ids) if uuid not in existing]
+    
+    def embed_batch(batch: List[Authority]) -> Tuple[List[Authority], List[Optional[np.ndarray]]]:
+        if existing_count != 0:
+            batch = drop_existing(batch)
+        texts = [build_embedding_text(auth) for auth in batch]
+        if not texts:
+            return batch, []
+        if embedding_cache is None:
+            # One embeddings request for the whole batch
+            return batch, generate_embeddings(texts, client)
         
-        # Prepare batch data
-        objects = []
-        for auth in batch:
-            # Build embedding text
-            embedding_text = auth.label
-            if auth.alt_labels:
-                embedding_text += " | " + " | ".join(auth.alt_labels[:3])
-            if auth.scope_note:
-                embedding_text += " | " + auth.scope_note[:200]
-            
-            # Generate embedding
-            try:
-                vector = generate_embedding(embedding_text, client)
-                
-                # Build properties dict explicitly (avoid reserved keywords)
-                properties = {
-                    "uri": auth.uri,
-                    "label": auth.label,
-                    "alt_labels": auth.alt_labels or [],
-                    "broader_terms": auth.broader_terms or [],
-                    "narrower_terms": auth.narrower_terms or [],
-                    "scope_note": auth.scope_note,
-                    "subject_type": auth.subject_type,
-                    "vocabulary": auth.vocabulary,
-                    "language": auth.language
-                }
-                
-                objects.append(DataObject(
-                    properties=properties,
-                    vector=vector
-                ))
-            except Exception as e:
-                logger.error(f"Failed to process {auth.uri}: {e}")
-                errors.append((auth.uri, str(e)))
+        # Only embed texts missing from the cache (one request for all of them)
+        vectors = embedding_cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            fresh = generate_embeddings(missing_texts, client)
+            embedding_cache.put_many(missing_texts, fresh)
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+        return batch, vectors
+    
+    def insert_batch(wv_batch, batch_number: int, batch: List[Authority], future: Future):
+        nonlocal new_count
+        try:
+            batch, vectors = future.result()
+        except Exception as e:
+            logger.error(f"Failed to embed batch {batch_number}: {e}")
+            new_count += len(batch)
+            errors.extend((auth.uri, str(e)) for auth in batch)
+            return
+        
+        new_count += len(batch)
+        for auth, vector in zip(batch, vectors):
+            if vector is None:
+                errors.append((auth.uri, "embedding request rejected"))
                 continue
+            
+            # Queued; the batcher sends full batches in the background
+            wv_batch.add_object(
+                properties=auth.to_properties(),
+                # Deterministic ID: re-importing a URI overwrites instead of duplicating
+                uuid=generate_uuid5(auth.uri),
+                vector=vector
+            )
+    
+    # Embedding workers run ahead of the inserting (main) thread, so OpenAI and
+    # Weaviate latency overlap; at most max_pending batches are in flight.
+    # Inserts go through the collection's dynamic batcher, which sizes batches
+    # from server load, keeps several gRPC batch requests in flight and
+    # retries failed ones. Batches are inserted in
+    # completion order, so one slow embeddings request doesn't hold up the
+    # batches that finished after it.
+    max_pending = max_pending or 2 * embed_workers
+    pending: Dict[Future, Tuple[int, List[Authority]]] = {}
+    
+    def insert_completed(wv_batch, pbar):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            insert_batch(wv_batch, *pending.pop(future), future)
+            pbar.update(1)
+    
+    stream = counted_authorities()
+    batches = iter(lambda: list(itertools.islice(stream, batch_size)), [])
+    with ThreadPoolExecutor(max_workers=embed_workers) as executor, \
+            collection.batch.dynamic() as wv_batch, \
+            tqdm(desc="Indexing batches", unit="batch") as pbar:
+        for batch_number, batch in enumerate(batches, 1):
+            pending[executor.submit(embed_batch, batch)] = (batch_number, batch)
+            
+            if len(pending) >= max_pending:
+                insert_completed(wv_batch, pbar)
         
-        # Insert batch
-        if objects:
-            try:
-                collection.data.insert_many(objects)
-                logger.info(f"Batch {i//batch_size + 1}/{total_batches}: {len(objects)}/{len(batch)} indexed successfully")
-            except Exception as e:
-                logger.error(f"Batch insert failed: {e}")
-                errors.append((f"Batch {i//batch_size + 1}", str(e)))
+        while pending:
+            insert_completed(wv_batch, pbar)
+    
+    # Objects Weaviate rejected, reported once the batcher has flushed
+    for failed in collection.batch.failed_objects:
+        errors.append((failed.object_.properties.get("uri"), failed.message))
+    if errors:
+        logger.error(f"{len(errors)} authorities failed to index")
     
     authority_search.client.close()
     
-    return len(authority_list) - len(errors), errors
+    logger.info(f"Imported {new_count} new records (skipped {total_count - new_count} duplicates)")
+    
+    return new_count - len(errors), errors, total_count
 
 
 def main():
     parser = argparse.ArgumentParser(description='LCSH Authority Importer - Streaming Version')
     parser.add_argument('--input', required=True, help='Input N-Triples file (.nt)')
     parser.add_argument('--limit', type=int, help='Limit number of records to process')
-    parser.add_argument('--batch-size', type=int, default=100, help='Batch size for indexing')
+    parser.add_argument('--batch-size', type=int, default=512,
+                        help='Authorities per embeddings request (default: 512, API max 2048)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Parser processes for full-file parses (default: CPU count)')
+    parser.add_argument('--grouped', action='store_true',
+                        help="Single-pass, bounded-memory parse for files that keep each subject's "
+                             "triples together (LC bulk dumps)")
+    parser.add_argument('--embed-workers', type=int, default=8,
+                        help='Concurrent OpenAI embeddings requests (default: 8)')
+    parser.add_argument('--embedding-cache', default=str(settings.embedding_cache_path),
+                        help='On-disk embedding cache, shared with the API (default: EMBEDDING_CACHE_PATH)')
+    parser.add_argument('--no-embedding-cache', action='store_true',
+                        help='Always call OpenAI, bypassing the embedding cache')
     
     args = parser.parse_args()
     
@@ -376,6 +858,9 @@ def main():
     logger.info(f"Input file: {input_file}")
     logger.info(f"Limit: {args.limit or 'None'}")
     logger.info(f"Batch size: {args.batch_size}")
+    logger.info(f"Parser workers: {'grouped single pass' if args.grouped else args.workers}")
+    logger.info(f"Embedding workers: {args.embed_workers}")
+    logger.info(f"Embedding cache: {'disabled' if args.no_embedding_cache else args.embedding_cache}")
     logger.info("=" * 60)
     
     # Initialize Weaviate schema
@@ -384,25 +869,33 @@ def main():
     authority_search.initialize_schemas()
     authority_search.client.close()
     
-    # Stream parse file
-    logger.info("\nParsing LCSH data...")
-    authorities = stream_ntriples(input_file, limit=args.limit)
+    # Stream parsed authorities straight into Weaviate
+    logger.info("\nParsing and indexing LCSH data...")
+    authorities = stream_ntriples(
+        input_file, limit=args.limit, workers=args.workers, grouped=args.grouped
+    )
+    embedding_cache = None if args.no_embedding_cache else EmbeddingCache(Path(args.embedding_cache))
+    try:
+        success_count, errors, total_count = batch_index_authorities(
+            authorities, args.batch_size,
+            embed_workers=args.embed_workers,
+            embedding_cache=embedding_cache
+        )
+    finally:
+        if embedding_cache is not None:
+            embedding_cache.close()
     
-    if not authorities:
+    if not total_count:
         logger.error("No authorities extracted!")
         return 1
     
-    # Index into Weaviate
-    logger.info(f"\nIndexing {len(authorities)} authorities...")
-    success_count, errors = batch_index_authorities(authorities, args.batch_size)
-    
     # Summary
     logger.info("\n" + "=" * 60)
     logger.info("Import Complete!")
     logger.info("=" * 60)
-    logger.info(f"Total processed: {len(authorities)}")
+    logger.info(f"Total processed: {total_count}")
     logger.info(f"Total errors: {len(errors)}")
-    logger.info(f"Success rate: {success_count / len(authorities) * 100:.1f}%")
+    logger.info(f"Success rate: {success_count / total_count * 100:.1f}%")
     
     # Show stats
     authority_search.connect()
@@ -24,9 +24,12 @@ Usage:
 
 import sys
 import json
-import requests
+import functools
 from typing import List, Dict, Optional
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 
 
 @dataclass
@@ -49,11 +52,26 @@ class LOCRealtimeSearch:
     LOOKUP_API = "https://id.loc.gov/authorities/subjects/"
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'SubjectHeadingApp/1.0',
-            'Accept': 'application/json'
-        })
+        # One pooled HTTP/2 client: TLS sessions are reused across requests and
+        # concurrent detail lookups are multiplexed over the same connection
+        self.client = httpx.Client(
+            http2=True,
+            headers={
+                'User-Agent': 'SubjectHeadingApp/1.0',
+                'Accept': 'application/json'
+            },
+            limits=httpx.Limits(max_keepalive_connections=20),
+            # Unreachable LOC hosts fail in 2s instead of holding a slot
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            follow_redirects=True
+        )
+        
+        # LOC records change rarely; successful lookups are cached per URI
+        self._fetch_details = functools.lru_cache(maxsize=4096)(self._fetch_details_uncached)
+    
+    def close(self):
+        """Close the HTTP connection pool."""
+        self.client.close()
     
     def suggest_subjects(self, query: str, limit: int = 10) -> List[LOCSubject]:
         """
@@ -77,10 +95,9 @@ class LOCRealtimeSearch:
                 'count': limit
             }
             
-            response = self.session.get(
+            response = self.client.get(
                 self.SUGGEST_API,
-                params=params,
-                timeout=5
+                params=params
             )
             response.raise_for_status()
             
@@ -106,6 +123,12 @@ class LOCRealtimeSearch:
             print(f"❌ Error searching LOC: {e}")
             return []
     
+    def _fetch_details_uncached(self, uri: str) -> Dict:
+        # Request JSON-LD format (errors propagate, so failures aren't cached)
+        response = self.client.get(uri + ".json")
+        response.raise_for_status()
+        return response.json()
+    
     def get_subject_details(self, uri: str) -> Optional[Dict]:
         """
         Get full details for a subject by URI.
@@ -123,15 +146,7 @@ class LOCRealtimeSearch:
             Full subject data as dict
         """
         try:
-            # Request JSON-LD format
-            response = self.session.get(
-                uri + ".json",
-                timeout=5
-            )
-            response.raise_for_status()
-            
-            return response.json()
-            
+            return self._fetch_details(uri)
         except Exception as e:
             print(f"❌ Error fetching details: {e}")
             return None
@@ -140,7 +155,9 @@ class LOCRealtimeSearch:
         """
         Search and fetch full details for each result.
         
-        This is slower but gives you complete information.
+        This is slower but gives you complete information. Detail lookups
+        run concurrently, so the cost is about one extra round trip rather
+        than one per result.
         
         Args:
             query: Search term
@@ -152,14 +169,14 @@ class LOCRealtimeSearch:
         # First, get suggestions
         suggestions = self.suggest_subjects(query, limit)
         
-        # Then, fetch details for each
-        results = []
-        for subject in suggestions:
-            details = self.get_subject_details(subject.uri)
-            if details:
-                results.append(details)
+        if not suggestions:
+            return []
+        
+        # Then, fetch details for all of them at once
+        with ThreadPoolExecutor(max_workers=len(suggestions)) as executor:
+            details = executor.map(self.get_subject_details, [s.uri for s in suggestions])
         
-        return results
+        return [d for d in details if d]
 
 
 def format_subject(subject: LOCSubject) -> str:
@@ -230,6 +247,7 @@ def main():
     print(f"⚡ Latency: ~500ms per query")
     print("\n⚠️  Note: This is keyword matching, not semantic similarity")
     
+    searcher.close()
     return 0
 
 
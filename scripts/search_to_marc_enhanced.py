@@ -22,7 +22,7 @@ Usage:
         --toc "Chapter 1: Early History" "Chapter 2: Ming Dynasty Masters" \
         --limit 3
     
-    # From JSON file (for batch processing)
+    # From JSON file: one book object, or an array of them (batch processing)
     python scripts/search_to_marc_enhanced.py --from-json book_metadata.json
 """
 
@@ -35,8 +35,11 @@ from typing import List, Optional
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from authority_search import authority_search
-from models import Subject65X, Subfield
+from models import Subject65X
+from marc_common import authority_to_marc65x, dumps_json, format_marc_json, format_marc_listing
+
+# Books searched at once in --from-json batch mode
+BATCH_CONCURRENCY = 10
 
 
 def build_rich_query(
@@ -108,80 +111,6 @@ def build_rich_query(
     return rich_query
 
 
-def authority_to_marc65x(authority_candidate, score: float = None) -> Subject65X:
-    """Convert AuthorityCandidate to Subject65X MARC field."""
-    # Determine MARC tag based on subject type
-    subject_type = getattr(authority_candidate, 'subject_type', 'topical')
-    
-    if subject_type == 'geographic':
-        tag = '651'
-    elif subject_type == 'genre_form':
-        tag = '655'
-    else:  # topical or unknown
-        tag = '650'
-    
-    # Determine second indicator based on vocabulary
-    vocab = authority_candidate.vocabulary.lower()
-    if vocab == 'lcsh':
-        ind2 = '0'
-    elif vocab == 'fast':
-        ind2 = '7'
-    else:
-        ind2 = '7'
-    
-    # Parse heading into subfields
-    heading = authority_candidate.label
-    subfields = []
-    
-    # Check if heading has subdivisions (marked by --)
-    if '--' in heading:
-        parts = heading.split('--')
-        
-        # First part is always $a
-        subfields.append(Subfield(code='a', value=parts[0]))
-        
-        # Subsequent parts need classification
-        for part in parts[1:]:
-            # Determine subfield code
-            if any(keyword in part.lower() for keyword in ['century', 'b.c.', 'a.d.']) or (
-                '-' in part and any(char.isdigit() for char in part)
-            ):
-                code = 'y'  # Chronological
-            elif part[0].isupper() and not any(keyword in part.lower() for keyword in ['history', 'politics', 'social', 'conditions', 'civilization']):
-                code = 'z'  # Geographic
-            else:
-                code = 'x'  # General
-            
-            subfields.append(Subfield(code=code, value=part))
-    else:
-        # No subdivisions, just main heading
-        subfields.append(Subfield(code='a', value=heading))
-    
-    # Add authority record control number (URI)
-    if authority_candidate.uri:
-        subfields.append(Subfield(code='0', value=authority_candidate.uri))
-    
-    # Add source code if not LCSH
-    if vocab != 'lcsh':
-        subfields.append(Subfield(code='2', value=vocab))
-    
-    # Create Subject65X object
-    subject_65x = Subject65X(
-        tag=tag,
-        ind1='_',
-        ind2=ind2,
-        vocabulary=vocab,
-        heading_string=heading,
-        subfields=subfields,
-        uri=authority_candidate.uri,
-        source_system='ai_generated',
-        score=score or authority_candidate.score,
-        explanation=f"Matched with confidence {score or authority_candidate.score:.2%}"
-    )
-    
-    return subject_65x
-
-
 async def search_with_rich_context(
     title: str = "",
     author: str = "",
@@ -196,6 +125,9 @@ async def search_with_rich_context(
     """
     Search for subjects using rich book metadata.
     
+    Run it inside ``async with authority_search:``, so a batch of
+    searches shares one connection.
+    
     Returns:
         Tuple of (marc_fields, rich_query)
     """
@@ -215,33 +147,105 @@ async def search_with_rich_context(
         print(rich_query)
         print("=" * 80)
     
-    # Connect and search
-    authority_search.connect()
+    from authority_search import authority_search
     
-    try:
-        # Search authorities
-        results = await authority_search.search_authorities(
-            topic=rich_query,
-            vocabularies=["lcsh", "fast"],
-            limit_per_vocab=limit,
-            min_score=min_score
-        )
-        
-        # Convert to MARC 65X
-        marc_fields = []
-        for result in results:
-            marc_field = authority_to_marc65x(result, result.score)
-            marc_fields.append(marc_field)
-        
-        return marc_fields, rich_query
-        
-    finally:
-        authority_search.client.close()
+    # Search authorities
+    results = await authority_search.search_authorities(
+        topic=rich_query,
+        vocabularies=["lcsh", "fast"],
+        limit_per_vocab=limit,
+        min_score=min_score
+    )
+    
+    # Convert to MARC 65X
+    marc_fields = [authority_to_marc65x(result, result.score) for result in results]
+    
+    return marc_fields, rich_query
+
+
+def metadata_to_inputs(metadata: dict) -> dict:
+    """Map a book metadata record (accepting common key aliases) to search inputs."""
+    return {
+        'title': metadata.get('title', ''),
+        'author': metadata.get('author', ''),
+        'abstract': metadata.get('abstract', metadata.get('summary', '')),
+        'toc': metadata.get('toc', metadata.get('table_of_contents', [])),
+        'publisher_notes': metadata.get('publisher_notes', metadata.get('description', '')),
+        'keywords': metadata.get('keywords', [])
+    }
+
+
+async def search_batch(
+    books: List[dict],
+    limit: int = 5,
+    min_score: float = 0.70
+) -> List[List[Subject65X]]:
+    """
+    Search subjects for many books concurrently.
+    
+    Searches share the open Weaviate connection; at most BATCH_CONCURRENCY
+    run at a time to keep OpenAI and Weaviate load bounded.
+    
+    Args:
+        books: Book metadata records
+        limit: Max results per vocabulary
+        min_score: Minimum confidence score
+    
+    Returns:
+        MARC fields per book, in input order
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def search_one(book: dict) -> List[Subject65X]:
+        async with semaphore:
+            marc_fields, _ = await search_with_rich_context(
+                **metadata_to_inputs(book),
+                limit=limit,
+                min_score=min_score
+            )
+            return marc_fields
+    
+    return await asyncio.gather(*[search_one(book) for book in books])
 
 
-def format_marc_display(subject_65x: Subject65X) -> str:
-    """Format MARC field for human-readable display."""
-    return subject_65x.to_marc_string()
+async def run_batch(books: List[dict], args) -> int:
+    """Search a batch of books and write per-book results."""
+    from authority_search import authority_search
+    
+    sys.stdout.write(f"\n🔍 Enhanced Subject Search: {len(books)} books (min score {args.min_score:.0%})\n")
+    
+    # One connection for the whole batch; concurrent searches share it
+    async with authority_search:
+        results = await search_batch(books, limit=args.limit, min_score=args.min_score)
+    
+    if args.format == 'json':
+        out = [dumps_json([
+            {
+                'title': book.get('title', ''),
+                'marc_fields': [format_marc_json(mf) for mf in marc_fields]
+            }
+            for book, marc_fields in zip(books, results)
+        ])]
+    else:
+        out = []
+        for n, (book, marc_fields) in enumerate(zip(books, results), 1):
+            out.append("\n" + "=" * 80)
+            out.append(f"📚 [{n}/{len(books)}] {book.get('title') or '(untitled)'}: {len(marc_fields)} result(s)")
+            out.append("=" * 80)
+            out.extend(
+                format_marc_listing(i, marc_field, detailed=args.format == 'display')
+                for i, marc_field in enumerate(marc_fields, 1)
+            )
+    
+    total = sum(len(marc_fields) for marc_fields in results)
+    out.extend([
+        "\n" + "=" * 80,
+        f"📋 Ready to use: {total} MARC 65X field(s) for {len(books)} books",
+        "=" * 80
+    ])
+    sys.stdout.write("\n".join(out) + "\n")
+    
+    return 0 if total else 1
 
 
 async def main():
@@ -280,12 +284,17 @@ async def main():
         with open(json_path, 'r', encoding='utf-8') as f:
             metadata = json.load(f)
         
-        title = metadata.get('title', '')
-        author = metadata.get('author', '')
-        abstract = metadata.get('abstract', metadata.get('summary', ''))
-        toc = metadata.get('toc', metadata.get('table_of_contents', []))
-        publisher_notes = metadata.get('publisher_notes', metadata.get('description', ''))
-        keywords = metadata.get('keywords', [])
+        # An array of books is searched as one concurrent batch
+        if isinstance(metadata, list):
+            return await run_batch(metadata, args)
+        
+        inputs = metadata_to_inputs(metadata)
+        title = inputs['title']
+        author = inputs['author']
+        abstract = inputs['abstract']
+        toc = inputs['toc']
+        publisher_notes = inputs['publisher_notes']
+        keywords = inputs['keywords']
     else:
         # Use command line arguments
         title = args.title or ""
@@ -301,89 +310,74 @@ async def main():
         parser.print_help()
         return 1
     
-    print("\n🔍 Enhanced Subject Search")
-    print("=" * 80)
-    print(f"Input fields provided:")
-    if title: print(f"  • Title: {title}")
-    if author: print(f"  • Author: {author}")
-    if abstract: print(f"  • Abstract: {abstract[:60]}..." if len(abstract) > 60 else f"  • Abstract: {abstract}")
-    if toc: print(f"  • TOC entries: {len(toc)}")
-    if publisher_notes: print(f"  • Publisher notes: Yes")
-    if keywords: print(f"  • Keywords: {', '.join(keywords)}")
-    print(f"Min score: {args.min_score:.0%}")
-    print("=" * 80)
+    input_count = len([x for x in [title, author, abstract, toc, publisher_notes, keywords] if x])
+    
+    banner = ["\n🔍 Enhanced Subject Search", "=" * 80, "Input fields provided:"]
+    if title: banner.append(f"  • Title: {title}")
+    if author: banner.append(f"  • Author: {author}")
+    if abstract: banner.append(f"  • Abstract: {abstract[:60]}..." if len(abstract) > 60 else f"  • Abstract: {abstract}")
+    if toc: banner.append(f"  • TOC entries: {len(toc)}")
+    if publisher_notes: banner.append("  • Publisher notes: Yes")
+    if keywords: banner.append(f"  • Keywords: {', '.join(keywords)}")
+    banner.append(f"Min score: {args.min_score:.0%}")
+    banner.append("=" * 80)
+    sys.stdout.write("\n".join(banner) + "\n")
+    
+    # Deferred: loading the Weaviate and OpenAI clients takes over a second,
+    # which --help and input errors should not pay
+    from authority_search import authority_search
     
     # Search with rich context
-    marc_fields, rich_query = await search_with_rich_context(
-        title=title,
-        author=author,
-        abstract=abstract,
-        toc=toc,
-        publisher_notes=publisher_notes,
-        keywords=keywords,
-        limit=args.limit,
-        min_score=args.min_score,
-        verbose=args.verbose
-    )
+    async with authority_search:
+        marc_fields, rich_query = await search_with_rich_context(
+            title=title,
+            author=author,
+            abstract=abstract,
+            toc=toc,
+            publisher_notes=publisher_notes,
+            keywords=keywords,
+            limit=args.limit,
+            min_score=args.min_score,
+            verbose=args.verbose
+        )
     
     if not marc_fields:
-        print("\n❌ No results found above confidence threshold")
-        print(f"Try lowering --min-score (current: {args.min_score:.0%})")
+        sys.stdout.write(
+            "\n❌ No results found above confidence threshold\n"
+            f"Try lowering --min-score (current: {args.min_score:.0%})\n"
+        )
         return 1
     
-    print(f"\n✅ Found {len(marc_fields)} result(s)\n")
+    # Output is collected and written in one call
+    out = [f"\n✅ Found {len(marc_fields)} result(s)\n"]
     
     # Display results
     if args.format == 'compact':
-        print("📋 MARC 65X Fields (ready to copy/paste):\n")
-        print("=" * 80)
-        for i, marc_field in enumerate(marc_fields, 1):
-            vocab_tag = f" ({marc_field.vocabulary.upper()})" if marc_field.vocabulary != 'lcsh' else ""
-            print(f"{i:2}. {format_marc_display(marc_field):70s} [{marc_field.score:.0%}]{vocab_tag}")
-        print("=" * 80)
+        out.append("📋 MARC 65X Fields (ready to copy/paste):\n")
+        out.append("=" * 80)
+        out.extend(format_marc_listing(i, marc_field) for i, marc_field in enumerate(marc_fields, 1))
+        out.append("=" * 80)
     
     elif args.format == 'display':
-        print("📋 MARC 65X Fields:\n")
-        print("=" * 80)
-        for i, marc_field in enumerate(marc_fields, 1):
-            print(f"{i:2}. {format_marc_display(marc_field)}")
-            vocab_indicator = f"({marc_field.vocabulary.upper()})" if marc_field.vocabulary != 'lcsh' else ""
-            print(f"    Confidence: {marc_field.score:.1%} {vocab_indicator}")
-            print("    Subfields:")
-            for sf in marc_field.subfields:
-                sf_meaning = {
-                    'a': 'Main heading',
-                    'x': 'General subdivision',
-                    'y': 'Chronological subdivision',
-                    'z': 'Geographic subdivision',
-                    'v': 'Form subdivision',
-                    '0': 'Authority URI',
-                    '2': 'Source vocabulary'
-                }.get(sf.code, 'Other')
-                print(f"       ${sf.code} {sf.value} ({sf_meaning})")
-            print()
+        out.append("📋 MARC 65X Fields:\n")
+        out.append("=" * 80)
+        out.extend(
+            format_marc_listing(i, marc_field, detailed=True)
+            for i, marc_field in enumerate(marc_fields, 1)
+        )
     
     elif args.format == 'json':
-        output = []
-        for marc_field in marc_fields:
-            output.append({
-                'tag': marc_field.tag,
-                'ind1': marc_field.ind1,
-                'ind2': marc_field.ind2,
-                'subfields': [{'code': sf.code, 'value': sf.value} for sf in marc_field.subfields],
-                'vocabulary': marc_field.vocabulary,
-                'uri': marc_field.uri,
-                'score': marc_field.score,
-                'explanation': marc_field.explanation
-            })
-        print(json.dumps(output, indent=2, ensure_ascii=False))
+        out.append(dumps_json([format_marc_json(mf) for mf in marc_fields]))
     
     # Summary
-    print("\n" + "=" * 80)
-    print(f"💰 Cost: $0.00013 (1 embedding API call)")
-    print(f"📋 Ready to use: {len(marc_fields)} MARC 65X field(s)")
-    print(f"✨ Enhanced search used {len([x for x in [title, author, abstract, toc, publisher_notes, keywords] if x])} input fields")
-    print("=" * 80)
+    out.extend([
+        "\n" + "=" * 80,
+        f"💰 Cost: $0.00013 (1 embedding API call)",
+        f"📋 Ready to use: {len(marc_fields)} MARC 65X field(s)",
+        f"✨ Enhanced search used {input_count} input fields",
+        "=" * 80
+    ])
+    sys.stdout.write("\n".join(out) + "\n")
     
     return 0
 
@@ -0,0 +1,159 @@
+"""Semantic query cache for authority search.
+
+Caches search results keyed by the query embedding. A lookup is a hit when a
+cached query vector is close enough (cosine similarity >= threshold) to the
+new query vector, so near-identical topics ("Chinese calligraphy" vs
+"Calligraphy, Chinese") skip the Weaviate round trip.
+"""
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+
+class QueryCache:
+    """Thread-safe LRU + TTL cache of search results keyed by query embedding."""
+    
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 600,
+        similarity_threshold: float = 0.97
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of cached queries (LRU eviction)
+            ttl_seconds: Time-to-live for each entry
+            similarity_threshold: Minimum cosine similarity for a cache hit
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self._reset()
+    
+    def _reset(self, dim: Optional[int] = None):
+        """(Re)allocate slot storage; vectors live in one contiguous matrix."""
+        # Slot arrays: a lookup is one GEMV plus masks instead of a Python loop
+        self._matrix: Optional[np.ndarray] = (
+            np.zeros((self.max_size, dim), dtype=np.float32) if dim else None
+        )
+        self._expiry = np.full(self.max_size, -np.inf)
+        self._ns_ids = np.full(self.max_size, -1, dtype=np.int32)
+        self._results: List[Any] = [None] * self.max_size
+        self._keys: List[Optional[str]] = [None] * self.max_size
+        self._free: List[int] = list(range(self.max_size - 1, -1, -1))
+        
+        # embedding_hash -> slot, in LRU order
+        self._lru: "OrderedDict[str, int]" = OrderedDict()
+        self._namespaces: Dict[Hashable, int] = {}
+    
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 array."""
+        arr = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(arr)
+        return arr / norm if norm else arr
+    
+    def _release(self, slot: int):
+        """Return a slot to the free list."""
+        del self._lru[self._keys[slot]]
+        self._keys[slot] = None
+        self._results[slot] = None
+        self._expiry[slot] = -np.inf
+        self._ns_ids[slot] = -1
+        self._free.append(slot)
+    
+    def _allocate(self, now: float) -> int:
+        """Get a free slot, reclaiming expired entries first and then the LRU one."""
+        if not self._free:
+            for slot in np.flatnonzero((self._ns_ids >= 0) & (self._expiry <= now)):
+                self._release(int(slot))
+        if not self._free:
+            self._release(next(iter(self._lru.values())))
+        return self._free.pop()
+    
+    def get(self, vector: List[float], namespace: Hashable = None) -> Optional[Any]:
+        """
+        Look up a cached result for a query embedding.
+        
+        Args:
+            vector: Query embedding
+            namespace: Search parameters the cached result depends on
+        
+        Returns:
+            Cached result, or None on a miss
+        """
+        query = self._normalize(vector)
+        now = time.monotonic()
+        
+        with self._lock:
+            ns_id = self._namespaces.get(namespace)
+            if ns_id is None or self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+            
+            candidates = (self._ns_ids == ns_id) & (self._expiry > now)
+            scores = np.where(candidates, self._matrix @ query, -np.inf)
+            best = int(np.argmax(scores))
+            
+            if scores[best] < self.similarity_threshold:
+                self.misses += 1
+                return None
+            
+            self._lru.move_to_end(self._keys[best])
+            self.hits += 1
+            return self._results[best]
+    
+    def put(self, vector: List[float], result: Any, namespace: Hashable = None):
+        """
+        Store a result for a query embedding.
+        
+        Args:
+            vector: Query embedding
+            result: Search result to cache
+            namespace: Search parameters the result depends on
+        """
+        query = self._normalize(vector)
+        key = hashlib.blake2b(query.tobytes() + repr(namespace).encode("utf-8"), digest_size=16).hexdigest()
+        now = time.monotonic()
+        
+        with self._lock:
+            # First entry, or the embedding model changed dimensions
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self._reset(query.shape[0])
+            
+            slot = self._lru.get(key)
+            if slot is None:
+                slot = self._allocate(now)
+                self._keys[slot] = key
+                self._lru[key] = slot
+            self._lru.move_to_end(key)
+            
+            self._matrix[slot] = query
+            self._expiry[slot] = now + self.ttl_seconds
+            self._ns_ids[slot] = self._namespaces.setdefault(namespace, len(self._namespaces))
+            self._results[slot] = result
+    
+    def clear(self):
+        """Invalidate all cached results (e.g. after the index changes)."""
+        with self._lock:
+            self._reset()
+    
+    def stats(self) -> Dict:
+        """Return cache hit/miss statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._lru),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }